@@ -0,0 +1,15 @@
+"""
+Замеры производительности пакета Experiments, запускаются без сети:
+
+    python -m Benchmarks --quick            # уменьшенная сетка
+    python -m Benchmarks --save             # сохранить базовую линию Benchmarks/baseline.json
+    python -m Benchmarks --only 'POST *'    # только эндпоинты
+
+Для каждой точки сетки (двери, семьи, размер группы, симуляции) записываются
+p50/p99 задержки, пропускная способность и пик памяти (tracemalloc).
+Результаты сравниваются с базовой линией; при ухудшении больше порога
+(--threshold, по умолчанию 25%) замер помечается REGRESSION и код выхода равен 1.
+Базовая линия зависит от машины, ее нужно снимать там же, где идет сравнение.
+"""
+from .measure import measure, peak_memory, percentile
+from .baseline import compare, load, save
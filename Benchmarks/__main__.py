@@ -0,0 +1,64 @@
+import argparse
+import fnmatch
+import json
+import sys
+from Experiments import executor
+from . import baseline
+from .api import api_cases
+from .cases import get_cases, case_key
+from .measure import measure
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m Benchmarks",
+                                     description="Замеры производительности пакета Experiments и эндпоинтов API")
+    parser.add_argument("--quick", action="store_true", help="уменьшенная сетка размеров задач")
+    parser.add_argument("--only", default="*", help="шаблон имени замера, например 'monty_hall.*'")
+    parser.add_argument("--skip-api", action="store_true", help="без замеров через приложение FastAPI")
+    parser.add_argument("--repeat", type=int, default=7, help="количество запусков каждого замера")
+    parser.add_argument("--baseline", default=baseline.baseline_path, help="путь к JSON базовой линии")
+    parser.add_argument("--threshold", type=float, default=baseline.threshold,
+                        help="допустимое ухудшение относительно базовой линии, доля")
+    parser.add_argument("--save", action="store_true", help="сохранить результаты как новую базовую линию")
+    parser.add_argument("--json", action="store_true", help="вывод строк сравнения в формате JSON")
+    return parser.parse_args(argv)
+
+
+def format_row(row) -> str:
+    """Строка отчета: замер, задержки, пропускная способность, память и отношение к базовой линии"""
+    ratio = "" if row["time_ratio"] is None else f" x{row['time_ratio']:.2f} time x{row['memory_ratio'] or 0:.2f} mem"
+    flag = "  REGRESSION" if row["regression"] else ""
+    return (f"{row['case']:<75} p50 {row['p50_ms']:>10.3f} ms  p99 {row['p99_ms']:>10.3f} ms  "
+            f"{row['throughput'] or 0:>14,.0f}/s  {row['peak_kb']:>10.1f} KB{ratio}{flag}")
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    cases = list(get_cases(args.quick))
+    if not args.skip_api:
+        from main import app
+        cases.extend(api_cases(app, args.quick))
+
+    results = {}
+    try:
+        for item in cases:
+            key = case_key(item)
+            if not fnmatch.fnmatch(item["name"], args.only):
+                continue
+            results[key] = measure(item["func"], setup=item["setup"], repeat=args.repeat, units=item["units"])
+            print(format_row(baseline.compare({key: results[key]}, {})[0]), file=sys.stderr, flush=True)
+    finally:
+        executor.shutdown()
+
+    rows = baseline.compare(results, baseline.load(args.baseline), args.threshold)
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+    else:
+        print("\n".join(format_row(row) for row in rows))
+    if args.save:
+        baseline.save(results, args.baseline)
+    return int(any(row["regression"] for row in rows))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
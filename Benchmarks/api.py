@@ -0,0 +1,76 @@
+import asyncio
+import json
+from Experiments.result_cache import result_cache
+from Experiments.MontyHall.Logic import get_sweep_points
+from Experiments.PlaygroundParadox.Components import population_cache
+from .cases import case, weights
+
+
+async def asgi_request(app, method, path, body=None) -> tuple[int, bytes]:
+    """Запрос к ASGI-приложению внутри процесса без сети и без HTTP-клиента
+    возвращает статус ответа и тело целиком (для потоковых ответов - все строки)"""
+    payload = b"" if body is None else json.dumps(body).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench"), (b"content-type", b"application/json"),
+                                     (b"content-length", str(len(payload)).encode())],
+        "client": ("127.0.0.1", 0), "server": ("bench", 80)
+    }
+    messages = [{"type": "http.request", "body": payload, "more_body": False}]
+    status = None
+    chunks = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.Event().wait()  # тело уже отдано, ждем до отмены
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
+
+
+def call(app, method, path, body=None) -> bytes:
+    """Синхронная обертка над asgi_request, ошибка при статусе не 200"""
+    status, content = asyncio.run(asgi_request(app, method, path, body))
+    if status != 200:
+        raise RuntimeError(f"{method} {path}: {status} {content[:200]!r}")
+    return content
+
+
+def clear_caches():
+    """Очистка кэша результатов и кэша населений перед замером"""
+    result_cache.clear()
+    population_cache.clear()
+
+
+def api_cases(app, quick=False):
+    """Замеры эндпоинтов целиком: валидация, пул процессов, сериализация ответа
+    кэши результатов и населений очищаются перед каждым запуском, иначе замерялось бы только попадание в кэш
+    пик памяти учитывает только процесс приложения, без процессов пула"""
+    yield case("e2e", "GET /", {}, lambda: call(app, "GET", "/"))
+    for iteration in ((10 ** 5,) if quick else (10 ** 5, 10 ** 7)):
+        for mode in ("simulate", "paired"):
+            body = {"count_prize": 1, "count_doors": 10, "closed_doors": 2, "iterable": iteration, "mode": mode,
+                    "seed": 1}
+            yield case("e2e", "POST /monty_hall/simulate", {"mode": mode, "trials": iteration},
+                       lambda body=body: call(app, "POST", "/monty_hall/simulate", body),
+                       setup=clear_caches, units=iteration)
+    body = {"count_prize": [1, 2], "count_doors": {"start": 5, "stop": 20}, "closed_doors": [2, 3],
+            "iterable": 10 ** 4, "seed": 1}
+    points = len(get_sweep_points([1, 2], range(5, 21), [2, 3]))
+    yield case("e2e", "POST /monty_hall/sweep", {"points": points, "trials": 10 ** 4},
+               lambda: call(app, "POST", "/monty_hall/sweep", body), units=points * 10 ** 4)
+    for mode in ("exact", "simulate"):
+        body = {"weight": weights, "value": 30, "count_sim": 10 ** 5, "num_of_family": 1_000, "mode": mode,
+                "seed": 1}
+        yield case("e2e", "POST /playground/start_blood_tiles", {"mode": mode, "count_sim": 10 ** 5},
+                   lambda body=body: call(app, "POST", "/playground/start_blood_tiles", body),
+                   setup=clear_caches, units=10 ** 5 if mode == "simulate" else 1)
@@ -0,0 +1,44 @@
+import json
+import os
+import platform
+
+baseline_path = os.path.join(os.path.dirname(__file__), "baseline.json")
+threshold = 0.25  # Допустимое ухудшение относительно базовой линии (25%)
+
+
+def environment() -> dict:
+    """Описание машины, на которой снята базовая линия: сравнивать имеет смысл только с той же машиной"""
+    return {"python": platform.python_version(), "machine": platform.machine(), "cpu_count": os.cpu_count()}
+
+
+def load(path=baseline_path) -> dict:
+    """Базовая линия из JSON, пустая, если файла нет"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save(results: dict, path=baseline_path):
+    """Сохранение результатов как новой базовой линии"""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"environment": environment(), "results": results}, file, ensure_ascii=False, indent=2,
+                  sort_keys=True)
+
+
+def compare(results: dict, baseline: dict, limit=threshold) -> list[dict]:
+    """Сравнение p50 и пика памяти с базовой линией
+    возвращает строки с отношением к базовой линии и флагом регрессии (ухудшение больше limit)"""
+    rows = []
+    for key, result in results.items():
+        base = baseline.get("results", {}).get(key)
+        row = {"case": key, "p50_ms": result["p50_ms"], "p99_ms": result["p99_ms"],
+               "throughput": result["throughput"], "peak_kb": result["peak_kb"],
+               "time_ratio": None, "memory_ratio": None, "regression": False}
+        if base:
+            row["time_ratio"] = round(result["p50_ms"] / base["p50_ms"], 3) if base["p50_ms"] else None
+            row["memory_ratio"] = round(result["peak_kb"] / base["peak_kb"], 3) if base["peak_kb"] else None
+            row["regression"] = any(ratio is not None and ratio > 1 + limit
+                                    for ratio in (row["time_ratio"], row["memory_ratio"]))
+        rows.append(row)
+    return rows
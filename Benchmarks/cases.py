@@ -0,0 +1,69 @@
+import random
+from Experiments.MontyHall.Logic import get_result, get_result_numpy
+from Experiments.PlaygroundParadox.Components import ChildHouse, Population, population_cache
+from Experiments.PlaygroundParadox.Components.Family import Family
+from Experiments.PlaygroundParadox.casino_games.BloodTiles import BloodTiles
+from Models.PlaygroundParadox.BloodTiles import BloodTilesData
+
+weights = (55, 33, 9, 2, 1)  # Профиль семей по умолчанию
+
+
+def case(group, name, params, func, setup=None, units=1):
+    """Описание замера: группа, имя, параметры точки сетки, функция без аргументов,
+    подготовка перед каждым запуском и объем работы одного вызова"""
+    return {"group": group, "name": name, "params": params, "func": func, "setup": setup, "units": units}
+
+
+def case_key(item) -> str:
+    """Ключ замера в базовой линии: имя и параметры в фиксированном порядке"""
+    return item["name"] + "[" + ",".join(f"{key}={value}" for key, value in sorted(item["params"].items())) + "]"
+
+
+def monty_hall_cases(quick=False):
+    """get_result (объектный движок) и get_result_numpy по количеству дверей и игр"""
+    doors = (3, 10) if quick else (3, 10, 30)
+    for door in doors:
+        for iteration in ((1_000,) if quick else (1_000, 10_000)):
+            yield case("micro", "monty_hall.get_result", {"doors": door, "trials": iteration},
+                       lambda door=door, iteration=iteration: get_result(True, 1, door, 1, iteration),
+                       units=iteration)
+        for iteration in ((10 ** 5,) if quick else (10 ** 5, 10 ** 7)):
+            yield case("micro", "monty_hall.get_result_numpy", {"doors": door, "trials": iteration},
+                       lambda door=door, iteration=iteration: get_result_numpy(True, 1, door, 1, iteration, seed=1),
+                       units=iteration)
+
+
+def family_cases(quick=False):
+    """Family.condition_child по размеру семьи, ChildHouse и Population по количеству семей"""
+    for size in ((2, 10) if quick else (2, 5, 10, 30)):
+        family = Family((1, size), weight_born=(1,) * size, children_count=size)
+        yield case("micro", "family.condition_child", {"children": size},
+                   lambda family=family: [family.condition_child() for _ in range(1000)], units=1000)
+    for count in ((100, 1_000) if quick else (100, 1_000, 10_000)):
+        yield case("macro", "child_house", {"families": count},
+                   lambda count=count: ChildHouse(weights, count_family=count), setup=lambda: random.seed(1),
+                   units=count)
+    for count in ((1_000, 10 ** 5) if quick else (1_000, 10 ** 5, 10 ** 6)):
+        yield case("macro", "population", {"families": count},
+                   lambda count=count: Population(weights, count_family=count, seed=1), units=count)
+
+
+def blood_tiles_cases(quick=False):
+    """BloodTiles.start_simulate по размеру группы, количеству симуляций и семей
+    кэш населений очищается перед каждым запуском, поэтому в замер входит и генерация населения"""
+    for families in ((1_000,) if quick else (100, 1_000, 10_000)):
+        for value in ((5, 30) if quick else (5, 30, 100)):
+            for count_sim in ((10 ** 4,) if quick else (10 ** 4, 10 ** 5)):
+                data = BloodTilesData(weight=weights, value=value, count_sim=count_sim, num_of_family=families,
+                                      mode="simulate")
+                yield case("macro", "blood_tiles.start_simulate",
+                           {"families": families, "value": value, "count_sim": count_sim},
+                           lambda data=data: BloodTiles().start_simulate(data), setup=population_cache.clear,
+                           units=count_sim)
+
+
+def get_cases(quick=False):
+    """Все замеры функций пакета Experiments"""
+    yield from monty_hall_cases(quick)
+    yield from family_cases(quick)
+    yield from blood_tiles_cases(quick)
@@ -0,0 +1,51 @@
+import math
+import statistics
+import time
+import tracemalloc
+
+
+def percentile(values, q):
+    """Перцентиль q (0..100) по методу ближайшего ранга"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def peak_memory(func, setup=None) -> int:
+    """Пиковый объем памяти, выделенной за один вызов func, в байтах (tracemalloc, учитывает массивы NumPy)
+    замер идет отдельным запуском, потому что tracemalloc замедляет выполнение"""
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(func, setup=None, repeat=7, warmup=1, units=1) -> dict:
+    """Замер функции без аргументов
+    setup вызывается перед каждым запуском и в замер не входит (например, очистка кэшей)
+    units - объем работы одного вызова (игры, семьи, симуляции) для расчета пропускной способности
+    возвращает p50, p99, среднее в миллисекундах, единиц в секунду и пик памяти в КБ"""
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        func()
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    p50 = statistics.median(times)
+    return {
+        "repeat": repeat,
+        "p50_ms": round(p50 * 1000, 3),
+        "p99_ms": round(percentile(times, 99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(times) * 1000, 3),
+        "throughput": round(units / p50, 1) if p50 > 0 else None,
+        "peak_kb": round(peak_memory(func, setup) / 1024, 1)
+    }
@@ -0,0 +1,136 @@
+import time
+from functools import lru_cache
+import numpy as np
+from Experiments.executor import run_sharded
+from Experiments.metrics import timer, count_trials
+
+days = 365  # Дней в году по умолчанию
+max_days = 10_000  # Наибольшее количество дней (дни хранятся в int16)
+chunk_cells = 1 << 22  # Ячеек матрицы дней рождения в одном блоке
+shard_min = 100_000  # Минимум испытаний в одном шарде
+max_group = 1000  # Наибольший размер группы
+max_cells = 10 ** 9  # Предел испытаний * размер группы в одном запросе
+modes = ("exact", "simulate")  # Точный расчет или Монте-Карло
+
+
+def get_probabilities(count_days=days, weights=None) -> np.ndarray:
+    """Вероятности дней рождения: равномерные или по весам дней (неравномерное распределение)"""
+    if weights is None:
+        return np.full(count_days, 1 / count_days)
+    weight = np.asarray(weights, dtype=float)
+    if weight.ndim != 1 or len(weight) == 0 or (weight < 0).any() or weight.sum() <= 0:
+        raise ValueError("Веса дней должны быть неотрицательными и не все равны 0")
+    return weight / weight.sum()
+
+
+@lru_cache(maxsize=256)
+def exact_curve(max_size, count_days=days, weights: tuple | None = None) -> tuple:
+    """Точная вероятность совпадения дней рождения для групп 0..max_size
+    равномерный случай - формула произведения P(нет совпадений) = prod (1 - i / days),
+    неравномерный - P(нет совпадений в группе n) = n! * e_n(p_1..p_days), где e_n - элементарный
+    симметрический многочлен; f_n = n! * e_n пересчитывается по дням: f_n += n * p * f_(n-1),
+    все f_n не больше 1, поэтому переполнения и потери точности нет
+    возвращает кортеж вероятностей совпадения"""
+    if weights is None:
+        factors = np.clip(1 - np.arange(max_size) / count_days, 0, None)
+        distinct = np.r_[1.0, np.cumprod(factors)]
+    else:
+        distinct = np.zeros(max_size + 1)
+        distinct[0] = 1.0
+        size = np.arange(1, max_size + 1)
+        for p in get_probabilities(len(weights), weights):
+            distinct[1:] = distinct[1:] + size * p * distinct[:-1]
+    return tuple((1 - distinct).tolist())
+
+
+def first_match(birthdays: np.ndarray) -> np.ndarray:
+    """Позиция первого человека в каждой строке, чей день рождения уже встречался раньше в строке,
+    или ширина строки, если совпадений нет. Группа из первых n человек строки
+    содержит совпадение тогда и только тогда, когда first_match < n"""
+    order = np.argsort(birthdays, axis=1, kind="stable")
+    ordered = np.take_along_axis(birthdays, order, axis=1)
+    repeat = ordered[:, 1:] == ordered[:, :-1]
+    position = np.where(repeat, order[:, 1:], birthdays.shape[1])
+    return position.min(axis=1, initial=birthdays.shape[1])
+
+
+def sample_birthdays(rng: np.random.Generator, size, max_size, probabilities=None, count_days=days) -> np.ndarray:
+    """Матрица size x max_size дней рождения целыми числами (int16),
+    неравномерное распределение - через обратную функцию распределения (searchsorted)"""
+    if probabilities is None:
+        return rng.integers(count_days, size=(size, max_size), dtype=np.int16)
+    cdf = np.cumsum(probabilities)
+    cdf[-1] = 1.0
+    return np.searchsorted(cdf, rng.random((size, max_size)), side="right").astype(np.int16)
+
+
+def count_matches(rng: np.random.Generator, trials, max_size, count_days=days, weights=None) -> np.ndarray:
+    """Количество групп с совпадением для всех размеров 0..max_size блоками по chunk_cells ячеек:
+    строка размера max_size дает и все меньшие группы своими префиксами"""
+    probabilities = None if weights is None else get_probabilities(len(weights), weights)
+    step = max(1, chunk_cells // max_size)
+    counter = np.zeros(max_size + 1, dtype=np.int64)
+    for start in range(0, trials, step):
+        size = min(step, trials - start)
+        with timer("birthday", "sampling"):
+            birthdays = sample_birthdays(rng, size, max_size, probabilities, count_days)
+        with timer("birthday", "scoring"):
+            first = first_match(birthdays)
+            counter[1:] += np.cumsum(np.bincount(first, minlength=max_size + 1))[:max_size]
+    return counter
+
+
+def shard_matches(trials, seed, max_size, count_days, weights):
+    """Шард для пула процессов: count_matches на своем генераторе"""
+    return count_matches(np.random.default_rng(seed), trials, max_size, count_days, weights)
+
+
+def get_threshold(curve, start=2):
+    """Наименьший размер группы с вероятностью совпадения не меньше 50%, None, если такого нет"""
+    for size in range(start, len(curve)):
+        if curve[size] >= 0.5:
+            return size
+    return None
+
+
+def valid_data(data) -> bool:
+    """Проверка размера группы, количества дней и испытаний"""
+    count_days = len(data.weights) if data.weights is not None else data.days
+    first = 2 <= data.max_size <= max_group and 0 < count_days <= max_days
+    second = data.mode == "exact" or 0 < data.trials and data.trials * data.max_size <= max_cells
+    return data.mode in modes and first and second
+
+
+def birthday_exact(data) -> dict:
+    """Точная кривая вероятности совпадения для групп 2..max_size и порог 50%"""
+    start = time.perf_counter()
+    weights = None if data.weights is None else tuple(data.weights)
+    with timer("birthday", "scoring"):
+        curve = exact_curve(data.max_size, data.days, weights)
+    return {
+        "sizes": list(range(2, data.max_size + 1)),
+        "exact": [round(value * 100, 4) for value in curve[2:]],
+        "threshold": {"exact": get_threshold(curve)},
+        "trials": 0,
+        "time": round(time.perf_counter() - start, 6)
+    }
+
+
+async def birthday_simulate(data) -> dict:
+    """Кривая Монте-Карло в пуле процессов вместе с точной кривой для сравнения"""
+    result = birthday_exact(data)
+    start = time.perf_counter()
+    weights = None if data.weights is None else tuple(data.weights)
+    counter = await run_sharded(shard_matches, data.trials, sum, data.max_size, data.days, weights,
+                                seed=data.seed, min_size=shard_min)
+    seconds = time.perf_counter() - start
+    count_trials("birthday", data.trials, seconds)
+    rate = counter / data.trials
+    result.update({
+        "simulate": [round(float(value) * 100, 4) for value in rate[2:]],
+        "SE": [round(float(value), 4) for value in np.sqrt(rate * (1 - rate) / data.trials)[2:] * 100],
+        "trials": data.trials,
+        "time": round(seconds, 4)
+    })
+    result["threshold"]["simulate"] = get_threshold(rate)
+    return result
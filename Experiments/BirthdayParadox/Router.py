@@ -0,0 +1,55 @@
+from fastapi import APIRouter, HTTPException, Request
+from Models.Birthday_Paradox import BirthdayData
+from Experiments.result_cache import result_cache
+from Experiments.etag import static_response
+from .Logic import (
+    birthday_exact,
+    birthday_simulate,
+    valid_data
+)
+
+rules = """# 🎂 Парадокс дней рождения
+### Сколько людей нужно, чтобы у двоих совпал день рождения?
+
+---
+
+В году 365 дней, и кажется, что для совпадения нужны сотни людей. Но уже в группе из **23 человек**
+вероятность, что у кого-то дни рождения совпадут, больше **50%**, а при **57** — больше **99%**.
+
+#### 🕵️‍♂️ В чем секрет?
+Сравниваются не люди с вами, а **все пары** между собой. В группе из 23 человек таких пар уже **253**,
+и каждая пара — еще один шанс на совпадение.
+
+* **Точный расчет:** вероятность, что совпадений нет, равна произведению (1 - 1/365)(1 - 2/365)...
+* **Неравномерные дни:** если рождений в одни дни больше, чем в другие, совпадения случаются еще чаще.
+"""
+
+router = APIRouter(
+    prefix="/birthday",
+    tags=["BirthdayParadox"]
+)
+
+
+@router.get("/info")
+def info(request: Request):
+    return static_response(request, {
+        "status": "Good",
+        "rules": rules
+    })
+
+
+@router.post("/curve")
+async def birthday_curve(data: BirthdayData):
+    if not valid_data(data):
+        raise HTTPException(status_code=400, detail="Данные не прошли валидацию")
+
+    async def compute():
+        if data.mode == "exact":
+            return birthday_exact(data)
+        return await birthday_simulate(data)
+
+    try:
+        result_data = await result_cache.get_or_compute(result_cache.make_key("birthday/curve", data), compute)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    return result_data
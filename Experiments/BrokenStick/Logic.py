@@ -0,0 +1,185 @@
+import asyncio
+import math
+import time
+import numpy as np
+from Experiments.executor import run_in_pool, spawn_seeds
+from Experiments.metrics import timer, count_trials
+
+max_points = 10 ** 9  # Предел точек в одном запросе
+max_breaks = 10  # Наибольшее количество разломов (размерность точек)
+chunk_points = 1 << 20  # Точек в одном векторном блоке
+replicates = 16  # Независимые повторы (для QMC - случайные сдвиги), по их разбросу считается ошибка
+bits = 32  # Разрядность точек Соболя
+engines = ("random", "halton", "sobol")
+variants = ("uniform", "longer")
+primes = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29)  # Основания последовательности Халтона по координатам
+
+# Направляющие числа Соболя (Joe, Kuo) для координат 2..max_breaks:
+# степень s примитивного многочлена, его средние коэффициенты a и начальные m_1..m_s
+sobol_table = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+)
+
+
+def sobol_directions(dim) -> np.ndarray:
+    """Направляющие числа v_j (j = 1..bits) для первых dim координат, форма (dim, bits)
+    первая координата - последовательность ван дер Корпута, остальные - рекуррентность
+    v_j = v_{j-s} ^ (v_{j-s} >> s) ^ XOR_k a_k * v_{j-k}"""
+    directions = np.zeros((dim, bits), dtype=np.uint64)
+    directions[0] = [1 << (bits - j) for j in range(1, bits + 1)]
+    for d, (s, a, m) in enumerate(sobol_table[:dim - 1], start=1):
+        v = [m[j] << (bits - j - 1) for j in range(s)]
+        for j in range(s, bits):
+            value = v[j - s] ^ (v[j - s] >> s)
+            for k in range(1, s):
+                if (a >> (s - 1 - k)) & 1:
+                    value ^= v[j - k]
+            v.append(value)
+        directions[d] = v
+    return directions
+
+
+def sobol_points(index: np.ndarray, dim, shift: np.ndarray) -> np.ndarray:
+    """Точки Соболя с номерами index и цифровым сдвигом shift (XOR по координатам)
+    x_n = XOR v_j по единичным битам n: те же множества из 2^m первых точек, что и в коде Грея"""
+    directions = sobol_directions(dim)
+    index = index.astype(np.uint64)
+    value = np.broadcast_to(shift, (len(index), dim)).copy()
+    for j in range(int(index.max()).bit_length() if len(index) else 0):
+        value ^= ((index >> np.uint64(j)) & np.uint64(1))[:, None] * directions[:, j]
+    return value / 2.0 ** bits
+
+
+def halton_points(index: np.ndarray, dim, shift: np.ndarray) -> np.ndarray:
+    """Точки Халтона с номерами index + 1 и случайным сдвигом shift по модулю 1 (Крэнли-Паттерсон)
+    координата d - обращение цифр номера в системе счисления с основанием primes[d]"""
+    points = np.empty((len(index), dim))
+    for d in range(dim):
+        base = primes[d]
+        n = index + 1
+        value = np.zeros(len(index))
+        factor = 1 / base
+        while n.any():
+            n, digit = np.divmod(n, base)
+            value += factor * digit
+            factor /= base
+        points[:, d] = value
+    return (points + shift) % 1.0
+
+
+def get_points(engine, rng: np.random.Generator, index: np.ndarray, dim, shift) -> np.ndarray:
+    """Блок точек в [0, 1)^dim выбранным движком"""
+    if engine == "sobol":
+        return sobol_points(index, dim, shift)
+    if engine == "halton":
+        return halton_points(index, dim, shift)
+    return rng.random((len(index), dim))
+
+
+def break_uniform(points: np.ndarray) -> np.ndarray:
+    """Куски палки, сломанной сразу в точках points (k разломов): разности отсортированных точек"""
+    cuts = np.sort(points, axis=1)
+    return np.diff(cuts, axis=1, prepend=0.0, append=1.0)
+
+
+def break_longer(points: np.ndarray) -> np.ndarray:
+    """Куски палки, у которой каждый раз ломают самый длинный кусок в доле points[:, j] его длины"""
+    size, breaks = points.shape
+    pieces = np.zeros((size, breaks + 1))
+    pieces[:, 0] = 1.0
+    rows = np.arange(size)
+    for j in range(breaks):
+        longest = pieces[:, :j + 1].argmax(axis=1)
+        length = pieces[rows, longest]
+        pieces[rows, longest] = length * points[:, j]
+        pieces[:, j + 1] = length * (1 - points[:, j])
+    return pieces
+
+
+def can_form(pieces: np.ndarray) -> np.ndarray:
+    """Из кусков складывается многоугольник (при трех кусках - треугольник),
+    если самый длинный меньше суммы остальных, то есть меньше половины палки"""
+    return pieces.max(axis=1) < 0.5
+
+
+def evaluate(points: np.ndarray, variant="uniform") -> np.ndarray:
+    """Пакетная проверка для блока точек: строка - одна палка, столбец - один разлом"""
+    pieces = break_longer(points) if variant == "longer" else break_uniform(points)
+    return can_form(pieces)
+
+
+def exact_probability(breaks, variant="uniform"):
+    """Точная вероятность: 1 - (k + 1) / 2^k для k случайных разломов,
+    2 ln 2 - 1 для разлома длинного куска при k = 2, иначе неизвестна (None)"""
+    if variant == "uniform":
+        return 1 - (breaks + 1) / 2 ** breaks
+    if breaks == 2:
+        return 2 * math.log(2) - 1
+    return None
+
+
+def get_checkpoints(points) -> list[int]:
+    """Контрольные точки сходимости: степени двойки (на них QMC Соболя сбалансирован) и points"""
+    return [2 ** j for j in range(4, points.bit_length()) if 2 ** j < points] + [points]
+
+
+def run_replicate(points, seed, breaks, variant, engine) -> list[int]:
+    """Один повтор: points точек, количество успехов в каждой контрольной точке
+    seed задает случайные числа (random) или случайный сдвиг последовательности (halton, sobol)"""
+    rng = np.random.default_rng(seed)
+    shift = rng.integers(0, 2 ** bits, size=breaks, dtype=np.uint64) if engine == "sobol" else rng.random(breaks)
+    checkpoints = get_checkpoints(points)
+    hits = []
+    total = done = 0
+    for checkpoint in checkpoints:
+        while done < checkpoint:
+            index = np.arange(done, min(done + chunk_points, checkpoint))
+            with timer("broken_stick", "sampling"):
+                block = get_points(engine, rng, index, breaks, shift)
+            with timer("broken_stick", "scoring"):
+                total += int(evaluate(block, variant).sum())
+            done += len(index)
+        hits.append(total)
+    return hits
+
+
+def valid_data(data) -> bool:
+    """Проверка движка, варианта, количества разломов и точек"""
+    first = data.engine in engines and data.variant in variants and 2 <= data.breaks <= max_breaks
+    return first and replicates <= data.points <= max_points
+
+
+async def broken_stick(data) -> dict:
+    """Оценка вероятности по replicates независимым повторам в пуле процессов:
+    среднее повторов, стандартная ошибка по их разбросу и отклонение от точного значения"""
+    start = time.perf_counter()
+    size = data.points // replicates
+    seeds = spawn_seeds(data.seed, replicates)
+    results = await asyncio.gather(*(run_in_pool(run_replicate, size, seed, data.breaks, data.variant, data.engine)
+                                     for seed in seeds))
+    seconds = time.perf_counter() - start
+    count_trials("broken_stick", size * replicates, seconds)
+    with timer("broken_stick", "scoring"):
+        exact = exact_probability(data.breaks, data.variant)
+        rates = np.array(results) / np.array(get_checkpoints(size))
+        estimate = rates.mean(axis=0)
+        se = rates.std(axis=0, ddof=1) / replicates ** 0.5
+        curve = [{
+            "points": checkpoint * replicates,
+            "probability": round(float(value) * 100, 6),
+            "SE": round(float(error) * 100, 6),
+            "error": round(abs(float(value) - exact) * 100, 6) if exact is not None else None
+        } for checkpoint, value, error in zip(get_checkpoints(size), estimate, se)]
+    result = {"engine": data.engine, "variant": data.variant, "breaks": data.breaks,
+              "exact": round(exact * 100, 6) if exact is not None else None, "time": round(seconds, 4)}
+    result.update(curve[-1])
+    result["convergence"] = curve
+    return result
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, HTTPException, Request
+from Models.Broken_Stick import BrokenStickData
+from Experiments.result_cache import result_cache
+from Experiments.etag import static_response
+from .Logic import (
+    broken_stick,
+    valid_data
+)
+
+rules = """# 🥢 Задача о сломанной палке
+### Можно ли сложить треугольник из трех случайных кусков?
+
+---
+
+Палку длины **1** ломают в двух случайных точках. Из трех кусков получается треугольник,
+только если самый длинный кусок **короче половины** палки.
+
+* Если обе точки разлома выбираются сразу, треугольник выходит с вероятностью **1/4**.
+* Если сначала сломать палку, а потом сломать **более длинный** кусок, вероятность растет до **2 ln 2 − 1 ≈ 38.6%**.
+* При **k** разломах многоугольник из **k + 1** кусков складывается с вероятностью **1 − (k + 1) / 2ᵏ**.
+
+Квазислучайные точки (**Халтон**, **Соболь**) покрывают квадрат равномернее случайных,
+поэтому оценка сходится к точному ответу заметно быстрее.
+"""
+
+router = APIRouter(
+    prefix="/broken_stick",
+    tags=["BrokenStick"]
+)
+
+
+@router.get("/info")
+def info(request: Request):
+    return static_response(request, {
+        "status": "Good",
+        "rules": rules
+    })
+
+
+@router.post("/simulate")
+async def broken_stick_simulate(data: BrokenStickData):
+    if not valid_data(data):
+        raise HTTPException(status_code=400, detail="Данные не прошли валидацию")
+
+    async def compute():
+        return await broken_stick(data)
+
+    return await result_cache.get_or_compute(result_cache.make_key("broken_stick/simulate", data), compute)
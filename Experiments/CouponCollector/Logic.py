@@ -0,0 +1,195 @@
+import time
+from functools import lru_cache
+import numpy as np
+from Experiments.executor import run_in_pool, run_sharded
+from Experiments.metrics import timer, count_trials
+
+max_count = 100_000  # Наибольшее количество типов купонов
+max_cells = 10 ** 9  # Предел испытаний * типов купонов в одном запросе
+chunk_cells = 1 << 22  # Ячеек матрицы этапов в одном блоке
+shard_min = 1_000  # Минимум испытаний в одном шарде
+dp_limit = 2_000  # Наибольшее количество типов для точного распределения (ДП)
+integral_limit = 10_000  # Наибольшее количество типов для точного среднего при неравных вероятностях
+tail = 1e-6  # Остаток вероятности, на котором обрывается точное распределение
+curve_points = 200  # Точек функции распределения в ответе
+quantiles = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+modes = ("exact", "simulate")
+
+
+def get_probabilities(count, weights=None) -> np.ndarray:
+    """Вероятности типов купонов: равные или по весам"""
+    if weights is None:
+        return np.full(count, 1 / count)
+    weight = np.asarray(weights, dtype=float)
+    if weight.ndim != 1 or len(weight) == 0 or (weight <= 0).any():
+        raise ValueError("Веса купонов должны быть положительными")
+    return weight / weight.sum()
+
+
+@lru_cache(maxsize=1024)
+def exact_moments(count) -> tuple[float, float]:
+    """Точные среднее N * H_N и дисперсия N^2 * sum(1/k^2) - N * H_N при равных вероятностях"""
+    k = np.arange(1, count + 1, dtype=float)
+    harmonic = float(np.sum(1 / k))
+    return count * harmonic, count ** 2 * float(np.sum(1 / k ** 2)) - count * harmonic
+
+
+@lru_cache(maxsize=256)
+def exact_moments_weighted(weights: tuple) -> tuple[float, float]:
+    """Среднее и дисперсия при неравных вероятностях через пуассоновское вложение:
+    E[T] = int_0^inf (1 - prod(1 - exp(-p_i t))) dt, E[T^2] = int 2t(...) dt - E[T]
+    интегралы считаются по сетке до точки, где остаток вероятности меньше tail"""
+    p = get_probabilities(len(weights), weights)
+    stop = (np.log(len(p)) - np.log(tail)) / p.min()
+    t = np.linspace(0, stop, 20_001)
+    survival = np.empty_like(t)
+    for start in range(0, len(t), max(1, chunk_cells // len(p))):
+        block = t[start:start + max(1, chunk_cells // len(p))]
+        with np.errstate(divide="ignore"):  # при t = 0 log(0) = -inf, остаток вероятности равен 1
+            survival[start:start + len(block)] = -np.expm1(np.log1p(-np.exp(-np.outer(block, p))).sum(axis=1))
+    mean = float(np.trapezoid(survival, t))
+    second = float(np.trapezoid(2 * t * survival, t)) - mean
+    return mean, second - mean ** 2
+
+
+@lru_cache(maxsize=64)
+def exact_distribution(count) -> np.ndarray:
+    """Точная функция распределения P(T <= t), t = 0, 1, ... при равных вероятностях:
+    ДП по количеству собранных типов k, за одно вытягивание k -> k + 1 с вероятностью (N - k) / N
+    расчет обрывается, когда P(T > t) < tail"""
+    state = np.zeros(count + 1)
+    state[0] = 1.0
+    new = (count - np.arange(count)) / count  # вероятность нового типа при k собранных
+    cdf = [0.0]
+    while 1 - cdf[-1] >= tail:
+        moved = state[:-1] * new
+        state[:-1] -= moved
+        state[1:] += moved
+        cdf.append(state[-1])
+    return np.array(cdf)
+
+
+def exact_result(count, weights=None) -> dict:
+    """Точные среднее, дисперсия и (при равных вероятностях и count <= dp_limit) распределение"""
+    if weights is None:
+        mean, variance = exact_moments(count)
+    elif count <= integral_limit:
+        mean, variance = exact_moments_weighted(tuple(weights))
+    else:
+        return {}
+    result = {"mean": round(mean, 4), "variance": round(variance, 4), "std": round(variance ** 0.5, 4)}
+    if weights is None and count <= dp_limit:
+        cdf = exact_distribution(count)
+        points = np.unique(np.linspace(0, len(cdf) - 1, curve_points).astype(np.int64))
+        result["distribution"] = {"draws": points.tolist(), "cdf": [round(float(cdf[t]), 6) for t in points]}
+        result["quantiles"] = {name: int(np.searchsorted(cdf, q)) for name, q in quantiles.items()}
+    return result
+
+
+def simulate_equal(rng: np.random.Generator, trials, count) -> np.ndarray:
+    """Количество вытягиваний в trials испытаниях при равных вероятностях:
+    сумма геометрических величин этапов, на этапе k новый тип выпадает с вероятностью (N - k) / N
+    испытания и этапы обрабатываются блоками, матрица блока не больше chunk_cells ячеек"""
+    new = (count - np.arange(count)) / count
+    draws = np.zeros(trials, dtype=np.int64)
+    rows = min(trials, chunk_cells)
+    step = max(1, chunk_cells // rows)
+    for first in range(0, trials, rows):
+        size = min(rows, trials - first)
+        for start in range(0, count, step):
+            stages = new[start:start + step]
+            draws[first:first + size] += rng.geometric(stages, size=(size, len(stages))).sum(axis=1)
+    return draws
+
+
+def simulate_weighted(rng: np.random.Generator, trials, probabilities: np.ndarray) -> np.ndarray:
+    """Количество вытягиваний при неравных вероятностях:
+    порядок появления типов - сортировка экспоненциальных времен Exp(p_i) (пуассоновское вложение),
+    после k собранных типов новый выпадает с вероятностью 1 - (сумма их вероятностей)"""
+    count = len(probabilities)
+    draws = np.zeros(trials, dtype=np.int64)
+    step = max(1, chunk_cells // count)
+    for start in range(0, trials, step):
+        size = min(step, trials - start)
+        order = np.argsort(rng.exponential(size=(size, count)) / probabilities, axis=1)
+        collected = np.cumsum(probabilities[order], axis=1)[:, :-1]
+        new = np.clip(np.c_[np.ones(size), 1 - collected], 1e-12, 1)
+        draws[start:start + size] = rng.geometric(new).sum(axis=1)
+    return draws
+
+
+def shard_draws(trials, seed, count, weights) -> dict:
+    """Шард для пула процессов: частоты количества вытягиваний, их сумма и сумма квадратов
+    различных значений не больше min(trials, разброс), поэтому в основной процесс
+    передается сжатая гистограмма, а не значение каждого испытания"""
+    rng = np.random.default_rng(seed)
+    with timer("coupon_collector", "sampling"):
+        if weights is None:
+            draws = simulate_equal(rng, trials, count)
+        else:
+            draws = simulate_weighted(rng, trials, get_probabilities(count, weights))
+    with timer("coupon_collector", "scoring"):
+        values, counts = np.unique(draws, return_counts=True)
+        return {"values": values, "counts": counts, "sum": int(draws.sum()), "sumsq": int((draws ** 2).sum())}
+
+
+def merge_draws(results: list[dict]) -> dict:
+    """Объединение гистограмм шардов: частоты одинаковых значений складываются"""
+    values, inverse = np.unique(np.concatenate([result["values"] for result in results]), return_inverse=True)
+    counts = np.bincount(inverse, weights=np.concatenate([result["counts"] for result in results]))
+    return {"values": values, "counts": counts.astype(np.int64),
+            "sum": sum(result["sum"] for result in results), "sumsq": sum(result["sumsq"] for result in results)}
+
+
+def summarize(draws: dict) -> dict:
+    """Среднее, стандартное отклонение, ошибка среднего, квантили и гистограмма по объединенным частотам"""
+    values, counts = draws["values"], draws["counts"]
+    trials = int(counts.sum())
+    mean = draws["sum"] / trials
+    std = max(draws["sumsq"] / trials - mean ** 2, 0.0) ** 0.5
+    cumulative = np.cumsum(counts)
+    histogram, edges = np.histogram(values, bins=min(50, int(values[-1] - values[0]) + 1), weights=counts)
+    return {
+        "mean": round(mean, 4),
+        "std": round(std, 4),
+        "SE": round(std / trials ** 0.5, 4),
+        # Обратная функция распределения: наименьшее значение с долей не меньше q
+        "quantiles": {name: int(values[np.searchsorted(cumulative, q * trials)]) for name, q in quantiles.items()},
+        "histogram": {"edges": edges.round(2).tolist(), "counts": histogram.astype(np.int64).tolist()}
+    }
+
+
+def get_count(data) -> int:
+    """Количество типов купонов: по весам, если они заданы"""
+    return len(data.weights) if data.weights is not None else data.count
+
+
+def valid_data(data) -> bool:
+    """Проверка количества типов, испытаний и режима"""
+    count = get_count(data)
+    first = data.mode in modes and 1 <= count <= max_count
+    second = data.mode == "exact" or 0 < data.trials and data.trials * count <= max_cells
+    return first and second
+
+
+def coupon_exact(data) -> dict:
+    """Точный расчет: среднее, дисперсия и распределение, где они доступны"""
+    start = time.perf_counter()
+    with timer("coupon_collector", "scoring"):
+        exact = exact_result(get_count(data), data.weights)
+    return {"count": get_count(data), "exact": exact, "trials": 0, "time": round(time.perf_counter() - start, 6)}
+
+
+async def coupon_simulate(data) -> dict:
+    """Монте-Карло в пуле процессов вместе с точным расчетом для сравнения"""
+    result = await run_in_pool(coupon_exact, data)
+    start = time.perf_counter()
+    weights = None if data.weights is None else tuple(data.weights)
+    draws = await run_sharded(shard_draws, data.trials, merge_draws, get_count(data), weights,
+                              seed=data.seed, min_size=shard_min)
+    seconds = time.perf_counter() - start
+    count_trials("coupon_collector", data.trials, seconds)
+    with timer("coupon_collector", "scoring"):
+        result["simulate"] = summarize(draws)
+    result.update({"trials": data.trials, "time": round(seconds, 4)})
+    return result
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, HTTPException, Request
+from Models.Coupon_Collector import CouponData
+from Experiments.result_cache import result_cache
+from Experiments.executor import run_in_pool
+from Experiments.etag import static_response
+from .Logic import (
+    coupon_exact,
+    coupon_simulate,
+    valid_data
+)
+
+rules = """# 🎟️ Задача о собирателе купонов
+### Сколько шоколадок нужно купить, чтобы собрать все N наклеек?
+
+---
+
+В каждой покупке лежит один из **N** купонов, все типы равновероятны.
+Пока собрано **k** типов, новый выпадает с вероятностью **(N − k) / N**,
+поэтому ожидание нового — **N / (N − k)** покупок.
+
+Складывая по всем этапам, получаем среднее **N · H_N ≈ N · ln N**:
+для **50** купонов это около **225** покупок, хотя последний купон в среднем ждут целых **50**.
+
+Если типы встречаются с разной вероятностью, собирать приходится еще дольше —
+основное время уходит на самые редкие купоны.
+"""
+
+router = APIRouter(
+    prefix="/coupon_collector",
+    tags=["CouponCollector"]
+)
+
+
+@router.get("/info")
+def info(request: Request):
+    return static_response(request, {
+        "status": "Good",
+        "rules": rules
+    })
+
+
+@router.post("/simulate")
+async def coupon_collector_simulate(data: CouponData):
+    if not valid_data(data):
+        raise HTTPException(status_code=400, detail="Данные не прошли валидацию")
+
+    async def compute():
+        if data.mode == "exact":
+            return await run_in_pool(coupon_exact, data)
+        return await coupon_simulate(data)
+
+    try:
+        result_data = await result_cache.get_or_compute(result_cache.make_key("coupon_collector/simulate", data), compute)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    return result_data
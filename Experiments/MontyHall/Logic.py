@@ -1,4 +1,13 @@
+import asyncio
 import random
+import time
+from fractions import Fraction
+from functools import lru_cache
+from itertools import combinations
+import numpy as np
+from Experiments.executor import run_in_pool, run_sharded, spawn_seeds
+from Experiments.estimates import progress_stream, adaptive_run
+from Experiments.metrics import timer, count_trials
 
 
 class Door:
@@ -13,6 +22,13 @@ class Door:
 
 
 strategy = (True, False)  # Стратегии менять, не менять
+chunk_size = 1_000_000  # Размер блока игр векторного движка
+max_iteration = {"objects": 100_000, "numpy": 10 ** 8}  # Предел итераций для каждого движка
+# Точный расчет по формуле, перебор исходов, симуляция, до заданной точности, парная
+modes = ("exact", "enumerate", "simulate", "adaptive", "paired")
+enumerate_limit = 10  # Максимум дверей для полного перебора исходов
+max_sweep_axis = 1_000  # Наибольшая длина одной оси сетки
+max_sweep_points = 10_000  # Наибольшее количество точек сетки (произведение длин осей)
 
 
 def put_the_prize(door_list: list[Door], count_prize=1):
@@ -83,6 +99,206 @@ def get_result(
     return False
 
 
+def simulate_games(rng: np.random.Generator, iteration, count_prize, count_door, closed_door):
+    """Векторная симуляция iteration игр за один проход.
+    iteration может быть формой массива, а параметры - массивами, согласованными с ней по размерностям.
+    Двери в каждой игре перенумерованы так, что призы стоят за дверями 0..count_prize-1,
+    поэтому расстановка призов и первый выбор задаются одним массивом индексов pick.
+    Ведущий оставляет закрытыми все оставшиеся призы и добирает пустые двери до closed_door,
+    смена выбора - случайный индекс switch среди закрытых дверей (призы в начале списка).
+    возвращает два булевых массива: победа без смены, победа со сменой"""
+    pick = rng.integers(count_door, size=iteration)  # первый выбор игрока
+    stay_win = pick < count_prize  # за выбранной дверью приз
+    prize_left = count_prize - stay_win  # призы среди закрытых ведущим дверей
+    switch = rng.integers(closed_door, size=iteration)  # выбор после смены
+    change_win = switch < prize_left
+    return stay_win, change_win
+
+
+def count_wins(rng: np.random.Generator, change, count_prize, count_door, closed_door, iteration, chunk=chunk_size):
+    """Подсчет побед блоками по chunk игр, память ограничена размером блока
+    возвращает количество побед выбранной стратегии"""
+    win = 0
+    for start in range(0, iteration, chunk):
+        size = min(chunk, iteration - start)
+        with timer("monty_hall", "sampling"):
+            stay_win, change_win = simulate_games(rng, size, count_prize, count_door, closed_door)
+        with timer("monty_hall", "scoring"):
+            win += int(np.count_nonzero(change_win if change else stay_win))
+    return win
+
+
+def count_paired(rng: np.random.Generator, count_prize, count_door, closed_door, iteration, chunk=chunk_size):
+    """Подсчет побед обеих стратегий на одних и тех же играх блоками по chunk игр
+    возвращает массив [победы без смены, победы со сменой, победы обеих стратегий в одной игре]"""
+    counts = np.zeros(3, dtype=np.int64)
+    for start in range(0, iteration, chunk):
+        size = min(chunk, iteration - start)
+        with timer("monty_hall", "sampling"):
+            stay_win, change_win = simulate_games(rng, size, count_prize, count_door, closed_door)
+        with timer("monty_hall", "scoring"):
+            counts += (np.count_nonzero(stay_win), np.count_nonzero(change_win),
+                       np.count_nonzero(stay_win & change_win))
+    return counts
+
+
+def get_result_numpy(
+        change=True,
+        count_prize=10,
+        count_door=30,
+        closed_door=10,
+        iteration=1000,
+        seed=None
+):
+    """Проведение эксперимента на массивах NumPy
+    возвращает процент угаданных дверей за которыми был приз, как и get_result"""
+    if valid_input_data(count_prize, count_door, closed_door):  # Проверка данных
+        rng = np.random.default_rng(seed)
+        win = count_wins(rng, change, count_prize, count_door, closed_door, iteration)
+        return round(win / iteration * 100, 2)  # Результат в процентах
+    print("Ошибка данных")
+    return False
+
+
+engines = {"objects": get_result, "numpy": get_result_numpy}  # Доступные движки симуляции
+
+
+def valid_iteration(iteration, engine="numpy"):
+    """Проверка количества итераций для выбранного движка"""
+    return engine in engines and 0 < iteration <= max_iteration[engine]
+
+
+def standard_error(percent, iteration):
+    """Стандартная ошибка доли в процентах"""
+    rate = percent / 100
+    return round((rate * (1 - rate) / iteration) ** 0.5 * 100, 4)
+
+
+def paired_difference(stay, change, both, iteration):
+    """Парная разность Change - Stay в процентных пунктах и ее стандартная ошибка
+    по играм d = change_win - stay_win: E[d^2] = (change + stay - 2 * both) / iteration"""
+    diff = (change - stay) / iteration
+    variance = (change + stay - 2 * both) / iteration - diff ** 2
+    return round(diff * 100, 2), round((max(variance, 0) / iteration) ** 0.5 * 100, 4)
+
+
+@lru_cache(maxsize=4096)
+def get_exact(count_prize, count_door, closed_door):
+    """Точные вероятности победы по формуле
+    без смены: prize / doors
+    со сменой: prize * (doors - 1) / (doors * closed)
+    возвращает (stay, change) в виде Fraction"""
+    stay = Fraction(count_prize, count_door)
+    change = Fraction(count_prize * (count_door - 1), count_door * closed_door)
+    return stay, change
+
+
+@lru_cache(maxsize=1024)
+def enumerate_exact(count_prize, count_door, closed_door):
+    """Точные вероятности победы полным перебором исходов без формулы,
+    используется для проверки get_exact при count_door <= enumerate_limit
+    перебираются расстановка призов, первый выбор игрока, пустые двери, оставленные
+    ведущим закрытыми, и дверь, на которую игрок меняет выбор; все варианты
+    на каждом уровне равновероятны
+    возвращает (stay, change) в виде Fraction"""
+    placements = tuple(combinations(range(count_door), count_prize))
+    stay = change = Fraction(0)
+    for prizes in placements:  # все расстановки призов равновероятны
+        for pick in range(count_door):  # первый выбор игрока
+            weight = Fraction(1, len(placements) * count_door)
+            prize_left = tuple(door for door in prizes if door != pick)
+            goats = [door for door in range(count_door) if door != pick and door not in prizes]
+            fills = tuple(combinations(goats, closed_door - len(prize_left)))
+            stay += weight * (pick in prizes)
+            for fill in fills:  # пустые двери, которые ведущий оставил закрытыми
+                closed = prize_left + fill
+                for target in closed:  # дверь после смены выбора
+                    change += weight / (len(fills) * len(closed)) * (target in prizes)
+    return stay, change
+
+
+def valid_enumerate(count_door):
+    """Перебор исходов доступен только для небольшого количества дверей"""
+    return count_door <= enumerate_limit
+
+
+def exact_experiment(count_prize=10, count_door=30, closed_door=10, method="formula"):
+    """Точный расчет вместо симуляции, результат в формате start_experiment
+    method="enumerate" - перебор исходов вместо формулы (только для count_door <= enumerate_limit)"""
+    start = time.perf_counter()
+    if method == "enumerate" and valid_enumerate(count_door):
+        stay, change = enumerate_exact(count_prize, count_door, closed_door)
+    else:
+        stay, change = get_exact(count_prize, count_door, closed_door)
+    data_other = {"Change": round(float(change) * 100, 2), "Change_SE": 0.0,
+                  "Stay": round(float(stay) * 100, 2), "Stay_SE": 0.0}
+    return {"Customizable": data_other, "trials": 0, "time": round(time.perf_counter() - start, 6)}
+
+
+def valid_sweep(lengths):
+    """Проверка длин осей сетки до ее построения: каждая ось и их произведение ограничены"""
+    return all(0 < length <= max_sweep_axis for length in lengths) and np.prod(lengths) <= max_sweep_points
+
+
+def get_sweep_points(prizes, doors, closed):
+    """Все корректные сочетания параметров сетки
+    возвращает список кортежей (count_prize, count_door, closed_door)"""
+    return [(prize, door, close)
+            for prize in prizes
+            for door in doors
+            for close in closed
+            if valid_input_data(prize, door, close)]
+
+
+def sweep_block(rng: np.random.Generator, points, iteration, chunk=chunk_size):
+    """Симуляция блока точек сетки одним векторным проходом:
+    строка массива - точка сетки, столбец - игра
+    возвращает количество побед без смены и со сменой для каждой точки"""
+    prize, door, close = (np.array(column)[:, None] for column in zip(*points))
+    step = max(1, chunk // len(points))  # Блок игр, чтобы блок точек занимал не больше chunk ячеек
+    stay = np.zeros(len(points), dtype=np.int64)
+    change = np.zeros(len(points), dtype=np.int64)
+    for start in range(0, iteration, step):
+        size = min(step, iteration - start)
+        with timer("monty_hall", "sampling"):
+            stay_win, change_win = simulate_games(rng, (len(points), size), prize, door, close)
+        with timer("monty_hall", "scoring"):
+            stay += np.count_nonzero(stay_win, axis=1)
+            change += np.count_nonzero(change_win, axis=1)
+    return stay, change
+
+
+def sweep_experiment(points, iteration=1000, seed=None, chunk=chunk_size):
+    """Симуляция сетки параметров блоками точек, в блоке не больше chunk игр на все точки:
+    строки блока отдаются сразу после его расчета, не дожидаясь всей сетки
+    генератор строк в формате Explore.create_pandas_table"""
+    rng = np.random.default_rng(seed)
+    block = max(1, chunk // iteration)  # Точек сетки в одном блоке
+    for first in range(0, len(points), block):
+        part = points[first:first + block]
+        stay, change = sweep_block(rng, part, iteration, chunk)
+        yield from sweep_rows(part, stay, change, iteration)
+
+
+def sweep_rows(points, stay, change, iteration):
+    """Строки ответа для блока точек сетки вместе с точными значениями"""
+    for (count_prize, count_door, closed_door), stay_count, change_count in zip(points, stay, change):
+        t_stay, t_change = get_exact(count_prize, count_door, closed_door)
+        change_rate = round(int(change_count) / iteration * 100, 2)
+        stay_rate = round(int(stay_count) / iteration * 100, 2)
+        yield {
+            "count_prize": count_prize,
+            "count_doors": count_door,
+            "closed_doors": closed_door,
+            "Change": change_rate,
+            "Change_SE": standard_error(change_rate, iteration),
+            "Stay": stay_rate,
+            "Stay_SE": standard_error(stay_rate, iteration),
+            "T_Change": round(float(t_change) * 100, 2),
+            "T_Stay": round(float(t_stay) * 100, 2)
+        }
+
+
 def get_base_case(iteration=1000, change=True):
     """Возвращает результат классического случая"""
     return get_result(change=change, count_prize=1, count_door=3, closed_door=1, iteration=iteration)
@@ -92,7 +308,8 @@ def start_experiment(
         count_prize=10,
         count_door=30,
         closed_door=10,
-        iteration=1000
+        iteration=1000,
+        engine="numpy"
 ):
 
     """Проведения двух экспериментов:
@@ -100,15 +317,119 @@ def start_experiment(
         - пользовательский
     возвращает результаты двух экспериментов в виде словаря:
     "Base": data_base, "Customizable": data_other
+    вместе с количеством игр "trials" и временем расчета "time" в секундах
+    engine - ключ из engines: "objects" (объекты Door) или "numpy" (векторный)
     """
+    get_engine_result = engines[engine]
+    start = time.perf_counter()
     data_other = {}
     for strat in strategy:
         if strat:
             strategy_name = "Change"
         else:
             strategy_name = "Stay"
-        data_other[strategy_name] = get_result(change=strat, count_prize=count_prize, count_door=count_door,
-                                               closed_door=closed_door,
-                                               iteration=iteration)
-    return {"Customizable": data_other}
+        data_other[strategy_name] = get_engine_result(change=strat, count_prize=count_prize, count_door=count_door,
+                                                      closed_door=closed_door,
+                                                      iteration=iteration)
+        data_other[f"{strategy_name}_SE"] = standard_error(data_other[strategy_name], iteration)
+    return {"Customizable": data_other, "trials": iteration, "time": round(time.perf_counter() - start, 4)}
+
+
+
+def shard_wins(iteration, seed, change, count_prize, count_door, closed_door):
+    """Шард для пула процессов: количество побед стратегии change в iteration играх"""
+    rng = np.random.default_rng(seed)
+    return count_wins(rng, change, count_prize, count_door, closed_door, iteration)
+
+
+def shard_paired(iteration, seed, count_prize, count_door, closed_door):
+    """Шард для пула процессов: счетчики count_paired в iteration играх"""
+    rng = np.random.default_rng(seed)
+    return count_paired(rng, count_prize, count_door, closed_door, iteration)
+
+
+async def run_paired(count_prize=10, count_door=30, closed_door=10, iteration=1000, seed=None):
+    """Парная симуляция в пуле процессов: обе стратегии оцениваются на одних и тех же играх,
+    поэтому генерация расстановок идет один раз, а разность Change - Stay имеет меньшую дисперсию
+    результат в формате start_experiment с полями Diff и Diff_SE"""
+    start = time.perf_counter()
+    stay, change, both = (int(count) for count in
+                          await run_sharded(shard_paired, iteration, sum, count_prize, count_door, closed_door,
+                                            seed=seed))
+    data_other = {}
+    for strategy_name, win in (("Change", change), ("Stay", stay)):
+        data_other[strategy_name] = round(win / iteration * 100, 2)
+        data_other[f"{strategy_name}_SE"] = standard_error(data_other[strategy_name], iteration)
+    data_other["Diff"], data_other["Diff_SE"] = paired_difference(stay, change, both, iteration)
+    count_trials("monty_hall", iteration, time.perf_counter() - start)
+    return {"Customizable": data_other, "trials": iteration, "time": round(time.perf_counter() - start, 4)}
+
+
+async def run_experiment(
+        count_prize=10,
+        count_door=30,
+        closed_door=10,
+        iteration=1000,
+        engine="numpy",
+        seed=None
+):
+    """start_experiment в пуле процессов
+    движок numpy делится на шарды с под-сидами от seed, объектный движок считается в одном процессе"""
+    if engine != "numpy":
+        result = await run_in_pool(start_experiment, count_prize, count_door, closed_door, iteration, engine)
+        count_trials("monty_hall", iteration * len(strategy), result["time"])
+        return result
+
+    start = time.perf_counter()
+    wins = await asyncio.gather(*(run_sharded(shard_wins, iteration, sum,
+                                              strat, count_prize, count_door, closed_door,
+                                              seed=strat_seed)
+                                  for strat, strat_seed in zip(strategy, spawn_seeds(seed, len(strategy)))))
+    data_other = {}
+    for strat, win in zip(strategy, wins):
+        strategy_name = "Change" if strat else "Stay"
+        data_other[strategy_name] = round(win / iteration * 100, 2)
+        data_other[f"{strategy_name}_SE"] = standard_error(data_other[strategy_name], iteration)
+    count_trials("monty_hall", iteration * len(strategy), time.perf_counter() - start)
+    return {"Customizable": data_other, "trials": iteration, "time": round(time.perf_counter() - start, 4)}
+
+
+def stream_experiment(
+        count_prize=10,
+        count_door=30,
+        closed_door=10,
+        iteration=1000,
+        seed=None,
+        every=100_000,
+        interval=0.25
+):
+    """Векторная симуляция с промежуточными оценками для потокового ответа
+    обе стратегии считаются на одних и тех же играх, расчет идет в одном потоке
+    генератор строк progress_stream: trials, Change, Change_SE, Change_CI, Stay, Stay_SE, Stay_CI"""
+    rng = np.random.default_rng(seed)
+
+    def draw(size):
+        with timer("monty_hall", "sampling"):
+            stay_win, change_win = simulate_games(rng, size, count_prize, count_door, closed_door)
+        with timer("monty_hall", "scoring"):
+            return {"Change": np.count_nonzero(change_win), "Stay": np.count_nonzero(stay_win)}
+
+    return progress_stream(draw, iteration, every=every, interval=interval)
+
+
+def adaptive_experiment(count_prize=10, count_door=30, closed_door=10, target_se=0.1, budget=5.0, seed=None):
+    """Векторная симуляция растущими блоками, пока стандартная ошибка обеих стратегий
+    не станет не больше target_se (в процентах) или не кончится бюджет времени budget
+    результат в формате start_experiment с полями Change_CI, Stay_CI и target_reached"""
+    rng = np.random.default_rng(seed)
+
+    def draw(size):
+        with timer("monty_hall", "sampling"):
+            stay_win, change_win = simulate_games(rng, size, count_prize, count_door, closed_door)
+        with timer("monty_hall", "scoring"):
+            return {"Change": np.count_nonzero(change_win), "Stay": np.count_nonzero(stay_win)}
 
+    update = adaptive_run(draw, target_se, budget=budget, max_trials=max_iteration["numpy"])
+    data_other = {key: update[key] for key in ("Change", "Change_SE", "Change_CI", "Stay", "Stay_SE", "Stay_CI")}
+    return {"Customizable": data_other, "trials": update["trials"], "time": update["time"],
+            "target_reached": update["target_reached"]}
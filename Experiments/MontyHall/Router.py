@@ -1,6 +1,25 @@
-from fastapi import APIRouter
-from Models.Monty_Hall import MontyHallData
-from Experiments.MontyHall.Logic import start_experiment, valid_input_data
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from Models.Monty_Hall import MontyHallData, MontyHallStreamData, MontyHallSweepData
+from Experiments.result_cache import result_cache
+from Experiments.executor import run_in_pool
+from Experiments.metrics import count_trials, ndjson_lines
+from Experiments.etag import static_response
+from Experiments.estimates import get_target_se, valid_target
+from Experiments.MontyHall.Logic import (
+    run_experiment,
+    run_paired,
+    exact_experiment,
+    valid_enumerate,
+    sweep_experiment,
+    stream_experiment,
+    adaptive_experiment,
+    get_sweep_points,
+    valid_sweep,
+    valid_input_data,
+    valid_iteration,
+    modes
+)
 
 router = APIRouter(
     prefix='/monty_hall',
@@ -31,21 +50,46 @@ rules = """
 
 
 @router.get("/info")
-def info():
-    return {
+def info(request: Request):
+    return static_response(request, {
         "status": "Good",
         "rules": rules
-    }
+    })
 
 
 @router.post("/simulate")
-def start_simulate(data: MontyHallData):
+async def start_simulate(data: MontyHallData):
     count_prize = data.count_prize
     count_door = data.count_doors
     closed_doors = data.closed_doors
-    if valid_input_data(count_prize=count_prize, count_door=count_door, closed_door=closed_doors):
+    iteration = data.iterable
+    exact = data.mode in ("exact", "enumerate")
+    adaptive = data.mode == "adaptive"
+    if adaptive:
+        valid_iter = valid_target(data.target_se, data.target_ci, data.time_budget)
+    else:
+        engine = "numpy" if data.mode == "paired" else data.engine  # парный режим есть только у векторного движка
+        valid_iter = data.mode in modes and (exact or valid_iteration(iteration, engine=engine))
+        valid_iter = valid_iter and (data.mode != "enumerate" or valid_enumerate(count_door))
+    if valid_iter and valid_input_data(count_prize=count_prize, count_door=count_door, closed_door=closed_doors):
+
+        async def compute():
+            if data.mode == "enumerate":  # перебор исходов занимает секунды, поэтому уходит в пул процессов
+                return await run_in_pool(exact_experiment, count_prize, count_door, closed_doors, "enumerate")
+            if exact:
+                return exact_experiment(count_prize=count_prize, count_door=count_door, closed_door=closed_doors)
+            if adaptive:
+                result = await run_in_pool(adaptive_experiment, count_prize, count_door, closed_doors,
+                                           get_target_se(data.target_se, data.target_ci), data.time_budget, data.seed)
+                count_trials("monty_hall", result["trials"], result["time"])
+                return result
+            if data.mode == "paired":
+                return await run_paired(count_prize=count_prize, count_door=count_door, closed_door=closed_doors,
+                                        iteration=iteration, seed=data.seed)
+            return await run_experiment(count_prize=count_prize, count_door=count_door, closed_door=closed_doors,
+                                        iteration=iteration, engine=data.engine, seed=data.seed)
 
-        result = start_experiment(count_prize=count_prize, count_door=count_door, closed_door=closed_doors)
+        result = await result_cache.get_or_compute(result_cache.make_key("monty_hall/simulate", data), compute)
         return {
             "status": "Good",
             "data": result
@@ -57,3 +101,42 @@ def start_simulate(data: MontyHallData):
             "name_error": "bad request",
             "msg": "Данные не прошли валидацию"
         }
+
+
+@router.post("/simulate_stream")
+def start_simulate_stream(data: MontyHallStreamData):
+    iteration = data.iterable
+    valid = valid_iteration(iteration) and data.every > 0 and data.interval > 0
+    if valid and valid_input_data(count_prize=data.count_prize, count_door=data.count_doors,
+                                  closed_door=data.closed_doors):
+        rows = stream_experiment(count_prize=data.count_prize, count_door=data.count_doors,
+                                 closed_door=data.closed_doors, iteration=iteration, seed=data.seed,
+                                 every=data.every, interval=data.interval)
+        return StreamingResponse(ndjson_lines(rows, "monty_hall"), media_type="application/x-ndjson")
+    else:
+        return {
+            "status": "Bad",
+            "error": "400",
+            "name_error": "bad request",
+            "msg": "Данные не прошли валидацию"
+        }
+
+
+@router.post("/sweep")
+async def start_sweep(data: MontyHallSweepData):
+    points = None
+    if valid_sweep(data.axis_lengths()):  # Размер сетки проверяется до построения точек
+        points = get_sweep_points(prizes=data.axis(data.count_prize),
+                                  doors=data.axis(data.count_doors),
+                                  closed=data.axis(data.closed_doors))
+    iteration = data.iterable
+    if points and valid_iteration(iteration * len(points)):
+        rows = sweep_experiment(points, iteration=iteration, seed=data.seed)
+        return StreamingResponse(ndjson_lines(rows, "monty_hall"), media_type="application/x-ndjson")
+    else:
+        return {
+            "status": "Bad",
+            "error": "400",
+            "name_error": "bad request",
+            "msg": "Данные не прошли валидацию"
+        }
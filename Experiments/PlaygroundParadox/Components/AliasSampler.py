@@ -0,0 +1,87 @@
+from functools import lru_cache
+import numpy as np
+
+
+class AliasSampler:
+    """
+    Выборка из дискретного распределения методом псевдонимов Уолкера/Воуза (Walker/Vose alias method).
+
+    Таблицы строятся один раз за O(k), каждая выборка - одно случайное число
+    ячейки и одно сравнение, независимо от количества значений k.
+
+    Attributes
+    ----------
+    values : np.ndarray
+        Возможные значения.
+    prob : np.ndarray
+        Вероятность оставить значение ячейки.
+    alias : np.ndarray
+        Индекс значения-заместителя ячейки.
+    """
+
+    def __init__(self, weights, values=None):
+        """
+        Parameters
+        ----------
+        weights : tuple
+            Неотрицательные веса значений, сумма больше 0.
+        values : tuple | None, optional
+            Значения, по умолчанию 1..len(weights).
+        """
+        weight = np.asarray(weights, dtype=float)
+        if weight.ndim != 1 or len(weight) == 0 or (weight < 0).any() or weight.sum() <= 0:
+            raise ValueError(f"Некорректные веса: {weights}")
+        count = len(weight)
+        self.values = np.arange(1, count + 1) if values is None else np.asarray(values)
+        if len(self.values) != count:
+            raise ValueError("Количество весов и значений не совпадает")
+
+        scaled = weight * count / weight.sum()
+        self.prob = np.ones(count)
+        self.alias = np.arange(count)
+        small = [i for i in range(count) if scaled[i] < 1]
+        large = [i for i in range(count) if scaled[i] >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+
+    def draw(self, rng: np.random.Generator, size) -> np.ndarray:
+        """
+        Выборка size значений одним векторным вызовом.
+
+        Parameters
+        ----------
+        rng : np.random.Generator
+            Генератор случайных чисел.
+        size : int
+            Количество значений.
+
+        Returns
+        -------
+        np.ndarray
+            Случайные значения.
+        """
+        cell = rng.integers(len(self.prob), size=size)
+        keep = rng.random(size) < self.prob[cell]
+        return self.values[np.where(keep, cell, self.alias[cell])]
+
+
+@lru_cache(maxsize=256)
+def get_sampler(weights: tuple, population: tuple) -> AliasSampler:
+    """
+    Сэмплер количества детей в семье для профиля весов, строится один раз.
+
+    Веса корректируются под диапазон так же, как в Family.incubator.
+
+    Parameters
+    ----------
+    weights : tuple
+        Веса для генерации количества детей (индекс 0 - один ребенок).
+    population : tuple[int, int]
+        Диапазон количества детей (min, max).
+    """
+    start, stop = population
+    return AliasSampler(weights[start - 1:stop], values=range(start, stop + 1))
@@ -8,13 +8,13 @@ class Child:
 
     Attributes
     ----------
-    born_data : datetime.date
-        Дата рождения ребенка.
+    born_ordinal : int
+        Дата рождения ребенка в виде date.toordinal().
     sex : str
         Пол ребенка ('Men' или 'Woman').
-    older : dict[str, int]
+    older_brother, older_sister : int
         Счетчики старших братьев и сестер.
-    younger : dict[str, int]
+    younger_brother, younger_sister : int
         Счетчики младших братьев и сестер.
     relative : bool
         Флаг наличия родственников в семье.
@@ -24,16 +24,39 @@ class Child:
         Список других детей в семье.
     """
 
-    def __init__(self, born_data: date, second_name=None):
-        self.born_data = born_data
+    def __init__(self, born_data: date | int, second_name=None):
+        self.born_ordinal = born_data if isinstance(born_data, int) else born_data.toordinal()
         self.sex = random.choice(("Men", "Woman"))
-        self.older = {"brother": 0, "sister": 0}
-        self.younger = {"brother": 0, "sister": 0}
+        self.older_brother = 0
+        self.older_sister = 0
+        self.younger_brother = 0
+        self.younger_sister = 0
         self.relative = False
         self.name = 0
         self.relative_list = []
         self.second_name = second_name
 
+    @property
+    def born_data(self) -> date:
+        """
+        Дата рождения ребенка.
+        """
+        return date.fromordinal(self.born_ordinal)
+
+    @property
+    def older(self) -> dict[str, int]:
+        """
+        Счетчики старших братьев и сестер.
+        """
+        return {"brother": self.older_brother, "sister": self.older_sister}
+
+    @property
+    def younger(self) -> dict[str, int]:
+        """
+        Счетчики младших братьев и сестер.
+        """
+        return {"brother": self.younger_brother, "sister": self.younger_sister}
+
     def get_num(self, num: int):
         """
         Присвоение порядкового номера ребенку.
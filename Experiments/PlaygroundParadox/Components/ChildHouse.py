@@ -1,5 +1,7 @@
 import random
+import numpy as np
 from .Family import Family
+from .AliasSampler import get_sampler
 
 
 class ChildHouse:
@@ -10,15 +12,16 @@ class ChildHouse:
     иметь братьев или сестер, перемешивания детей и получения статистики.
     """
 
-    def __init__(self, weights_born, count_family=100, population: tuple = (1, 5)):
+    def __init__(self, weights_born, count_family=100, population: tuple | None = None):
         """
         Инициализация ChildHouse и генерация семей и детей.
 
         Parameters
         ----------
-        population : tuple[int, int], optional
-            Диапазон количества детей в семьях (min, max), по умолчанию (1, 5).
+        population : tuple[int, int] | None, optional
+            Диапазон количества детей в семьях (min, max), по умолчанию (1, len(weights_born)).
         """
+        population = population or (1, len(weights_born))
         self.family_list = self.gen_family(population, weight_born=weights_born, count_family=count_family)
         self.all_children_list = self.all_children()
         self.chance_singleton_child()
@@ -29,6 +32,10 @@ class ChildHouse:
         """
         Генерация заданного количества семей.
 
+        Количество детей для всех семей выбирается одним вызовом AliasSampler,
+        построенным один раз на профиль весов, таблица месяцев для дат рождения
+        тоже строится один раз на все семьи.
+
         Parameters
         ----------
         population : tuple[int, int]
@@ -43,11 +50,16 @@ class ChildHouse:
         tuple[Family, ...]
             Кортеж объектов Family.
         """
+        rng = np.random.default_rng(random.getrandbits(64))  # согласован с random.seed
+        children_counts = get_sampler(tuple(weight_born), population).draw(rng, count_family).tolist()
+        table = Family.get_month_table()
         list_family = tuple(Family(population,
                                    weight_born=weight_born,
-                                   second_name=s_name
+                                   second_name=s_name,
+                                   children_count=children_count,
+                                   table=table
                                    )
-                            for s_name in range(count_family))
+                            for s_name, children_count in enumerate(children_counts))
         return list_family
 
     def get_shuffle_children(self, r=True) -> tuple:
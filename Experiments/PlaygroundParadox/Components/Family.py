@@ -1,7 +1,8 @@
 from datetime import datetime, date
+from itertools import groupby
 import random
-import calendar
 from .Child import Child
+from .Population import month_table
 
 
 class Family:
@@ -20,7 +21,8 @@ class Family:
         Фактическое количество детей в семье после генерации.
     """
 
-    def __init__(self, population: tuple, weight_born: tuple, second_name=None):
+    def __init__(self, population: tuple, weight_born: tuple, second_name=None, children_count=None,
+                 table: tuple | None = None):
         """
         Инициализация семьи. Генерация детей происходит сразу.
 
@@ -30,12 +32,17 @@ class Family:
             Диапазон количества детей (min, max) для генерации.
         weight_born : list[int]
             Список весов для генерации количества детей.
+        children_count : int | None, optional
+            Заранее выбранное количество детей, тогда веса не используются.
+        table : tuple | None, optional
+            Таблица get_month_table, общая для всех семей (ChildHouse строит ее один раз).
         """
         self.population = population
         self.children: tuple = ()
         self.weight = weight_born
-        self.children_count = 0
+        self.children_count = children_count or 0
         self.second_name = second_name
+        self.table = table
 
         # Генерация детей и присвоение условий
         self.incubator()
@@ -45,22 +52,63 @@ class Family:
         """
         Генерация количества детей в семье и их данных.
 
-        Использует random.choices для вероятностного выбора числа детей.
+        Использует random.choices для вероятностного выбора числа детей,
+        если оно не задано заранее (ChildHouse выбирает его сразу для всех семей).
         После определения количества детей создаются объекты Child.
         """
-        start, stop = self.population
-        values = range(start, stop + 1)
-        self.weight = self.weight[start - 1:]  # корректировка весов под диапазон
-        children_count = random.choices(values, weights=self.weight, k=1)[0]
-        self.children_count = children_count
+        if not self.children_count:
+            start, stop = self.population
+            values = range(start, stop + 1)
+            self.weight = self.weight[start - 1:stop]  # корректировка весов под диапазон
+            self.children_count = random.choices(values, weights=self.weight, k=1)[0]
+        children_count = self.children_count
+
+        # Таблица месяцев берется один раз, а не на каждого ребенка
+        table = self.table if self.table is not None else self.get_month_table()
 
         # Создание кортежа объектов Child
-        self.children = tuple(Child(self.gen_random_data(),
+        self.children = tuple(Child(self.gen_random_ordinal(table=table),
                                     second_name=self.second_name
                                     ) for _ in range(children_count))
 
     @staticmethod
-    def gen_random_data() -> date:
+    def get_month_table(years: int = 30) -> tuple:
+        """
+        Таблица месяцев month_table для последних years лет.
+        """
+        stop = datetime.now().year
+        return month_table(stop - years, stop)
+
+    @classmethod
+    def gen_random_ordinal(cls, years: int = 30, table: tuple | None = None) -> int:
+        """
+        Генерация случайной даты рождения для ребенка в виде date.toordinal().
+
+        Возраст детей ограничен years годами. Первый день и длина месяца берутся
+        из общей таблицы month_table, без создания объектов date.
+
+        Parameters
+        ----------
+        years : int, optional
+            Ограничение возраста детей в годах, по умолчанию 30.
+        table : tuple | None, optional
+            Готовая таблица get_month_table(years), чтобы не строить ее для каждого ребенка.
+
+        Returns
+        -------
+        int
+            Порядковый номер дня рождения.
+        """
+        first_day, count_day = table if table is not None else cls.get_month_table(years)
+
+        year = random.randrange(years)
+        month = random.randrange(12)
+        day = random.randrange(count_day.item(year, month))
+
+        return first_day.item(year, month) + day
+
+    @classmethod
+    def gen_random_data(cls) -> date:
         """
         Генерация случайной даты рождения для ребенка.
 
@@ -71,44 +119,34 @@ class Family:
         datetime.date
             Дата рождения ребенка.
         """
-        stop = datetime.now().year
-        start = stop - 30
-
-        year = random.randrange(start, stop)
-        month = random.randrange(1, 13)
-        count_day = calendar.monthrange(year, month)[1]
-        day = random.randrange(1, count_day + 1)
-
-        return date(year=year, month=month, day=day)
+        return date.fromordinal(cls.gen_random_ordinal())
 
     def condition_child(self):
         """
         Определение отношений между детьми в семье: старше/младше и брат/сестра.
 
-        Для каждой пары детей вычисляется разница по дате рождения и обновляются
-        соответствующие счетчики older и younger.
+        Дети сортируются по дате рождения, счетчики older и younger получаются
+        из количества мальчиков и девочек, родившихся раньше. Дети с одинаковой
+        датой рождения друг друга не считают.
         """
-        len_children = len(self.children)
-        for i in range(len_children - 1):
-            for j in range(i + 1, len_children):
-                child_1, child_2 = self.children[i], self.children[j]
-
-                # Добавляем друг друга в список родственников
-                child_1.get_relative(child_2)
-                child_2.get_relative(child_1)
-
-                sex = {"Men": "brother", "Woman": "sister"}
-                relative_sex_1 = sex[child_1.sex]
-                relative_sex_2 = sex[child_2.sex]
-
-                delta = (child_1.born_data - child_2.born_data).days
-                if delta > 0:
-                    child_1.older[relative_sex_2] += 1
-                    child_2.younger[relative_sex_1] += 1
-                elif delta < 0:
-                    child_1.younger[relative_sex_2] += 1
-                    child_2.older[relative_sex_1] += 1
-
-                # Флаг наличия родственников
-                child_1.relative = True
-                child_2.relative = True
+        brothers = sum(child.sex == "Men" for child in self.children)
+        sisters = len(self.children) - brothers
+        older_brother = older_sister = 0
+
+        children = sorted(self.children, key=lambda child: child.born_ordinal)
+        for _, group in groupby(children, key=lambda child: child.born_ordinal):
+            group = tuple(group)
+            group_brother = sum(child.sex == "Men" for child in group)
+            group_sister = len(group) - group_brother
+            for child in group:
+                child.older_brother = older_brother
+                child.older_sister = older_sister
+                child.younger_brother = brothers - older_brother - group_brother
+                child.younger_sister = sisters - older_sister - group_sister
+            older_brother += group_brother
+            older_sister += group_sister
+
+        # Список родственников и флаг их наличия: срезы кортежа без сравнения каждой пары
+        for i, child in enumerate(self.children):
+            child.relative_list = list(self.children[:i] + self.children[i + 1:])
+            child.relative = len(self.children) > 1
@@ -0,0 +1,258 @@
+from datetime import datetime, date
+from functools import lru_cache
+import calendar
+import numpy as np
+from .AliasSampler import get_sampler
+
+
+@lru_cache(maxsize=8)
+def month_table(start: int, stop: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Таблица месяцев для годов [start, stop).
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Порядковый номер (ordinal) первого дня каждого месяца и число дней в нем,
+        массивы формы (stop - start, 12).
+    """
+    first_day = np.array([[date(year, month, 1).toordinal() for month in range(1, 13)]
+                          for year in range(start, stop)], dtype=np.int64)
+    count_day = np.array([[calendar.monthrange(year, month)[1] for month in range(1, 13)]
+                          for year in range(start, stop)], dtype=np.int64)
+    return first_day, count_day
+
+
+def gen_birth_ordinals(rng: np.random.Generator, size: int, years: int = 30) -> np.ndarray:
+    """
+    Генерация дат рождения сразу для size детей в виде порядковых номеров дня.
+
+    Распределение совпадает с Family.gen_random_data: случайный год из последних
+    years лет, случайный месяц и случайный день этого месяца.
+
+    Parameters
+    ----------
+    rng : np.random.Generator
+        Генератор случайных чисел.
+    size : int
+        Количество дат.
+    years : int, optional
+        Ограничение возраста детей в годах, по умолчанию 30.
+
+    Returns
+    -------
+    np.ndarray
+        Массив date.toordinal() дат рождения.
+    """
+    stop = datetime.now().year
+    start = stop - years
+    first_day, count_day = month_table(start, stop)
+
+    year = rng.integers(0, years, size)
+    month = rng.integers(0, 12, size)
+    day = (rng.random(size) * count_day[year, month]).astype(np.int64)
+    return first_day[year, month] + day
+
+
+def sibling_order(family_id: np.ndarray, sex: np.ndarray, birth_ordinal: np.ndarray) -> dict:
+    """
+    Счетчики старших и младших братьев и сестер для каждого ребенка.
+
+    Аналог Family.condition_child для всего населения сразу: дети сортируются
+    по (семья, дата рождения), счетчики получаются из накопленных сумм мальчиков
+    и девочек внутри семьи. Дети с одинаковой датой рождения друг друга не считают.
+
+    Parameters
+    ----------
+    family_id : np.ndarray
+        Номер семьи ребенка.
+    sex : np.ndarray
+        Пол ребенка: 0 - 'Men', 1 - 'Woman'.
+    birth_ordinal : np.ndarray
+        Дата рождения в виде date.toordinal().
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        Массивы "older_brother", "older_sister", "younger_brother", "younger_sister"
+        в исходном порядке детей.
+    """
+    order = np.lexsort((birth_ordinal, family_id))
+    family, birth = family_id[order], birth_ordinal[order]
+    index = np.arange(len(order))
+
+    # индекс начала семьи и начала группы с одинаковой датой рождения для каждой позиции
+    new_family = np.r_[True, family[1:] != family[:-1]]
+    new_birth = new_family | np.r_[True, birth[1:] != birth[:-1]]
+    family_start = np.maximum.accumulate(np.where(new_family, index, 0))
+    birth_start = np.maximum.accumulate(np.where(new_birth, index, 0))
+    family_stop = np.r_[index[new_family][1:], len(order)][np.cumsum(new_family) - 1]
+    birth_stop = np.r_[index[new_birth][1:], len(order)][np.cumsum(new_birth) - 1]
+
+    result = {}
+    for code, name in ((0, "brother"), (1, "sister")):
+        before = np.r_[0, np.cumsum(sex[order] == code)]  # количество до позиции
+        older = before[birth_start] - before[family_start]
+        younger = before[family_stop] - before[birth_stop]
+        result[f"older_{name}"] = np.empty_like(older)
+        result[f"older_{name}"][order] = older
+        result[f"younger_{name}"] = np.empty_like(younger)
+        result[f"younger_{name}"][order] = younger
+    return result
+
+
+class Population:
+    """
+    Колоночное представление набора семей: один элемент массива на ребенка.
+
+    Заменяет объекты Family и Child там, где нужна только статистика,
+    и возвращает те же результаты, что и ChildHouse.
+
+    Attributes
+    ----------
+    family_sizes : np.ndarray
+        Количество детей в каждой семье.
+    family_id : np.ndarray
+        Номер семьи ребенка (аналог Child.second_name), отсортирован по возрастанию.
+    sex : np.ndarray
+        Пол ребенка: 0 - 'Men', 1 - 'Woman'.
+    birth_ordinal : np.ndarray
+        Дата рождения в виде date.toordinal().
+    birth_rank : np.ndarray
+        Порядок рождения внутри семьи, 0 - старший ребенок.
+    sibling_count : np.ndarray
+        Количество братьев и сестер у ребенка.
+    """
+
+    def __init__(self, weights_born, count_family=100, population: tuple | None = None, seed=None):
+        """
+        Генерация населения.
+
+        Parameters
+        ----------
+        weights_born : tuple
+            Веса для генерации количества детей в семье.
+        count_family : int, optional
+            Количество семей, по умолчанию 100.
+        population : tuple[int, int] | None, optional
+            Диапазон количества детей в семьях (min, max), по умолчанию (1, len(weights_born)).
+        seed : int | None, optional
+            Сид генератора случайных чисел.
+        """
+        population = population or (1, len(weights_born))
+        rng = np.random.default_rng(seed)
+        self.family_sizes = self.gen_family_sizes(rng, population, weight_born=weights_born,
+                                                  count_family=count_family)
+        self.family_id = np.repeat(np.arange(count_family), self.family_sizes)
+        self.sex = rng.integers(0, 2, len(self.family_id), dtype=np.int8)
+        self.birth_ordinal = gen_birth_ordinals(rng, len(self.family_id))
+        self.birth_rank = self.get_birth_rank()
+        self.sibling_count = self.family_sizes[self.family_id] - 1
+
+    @staticmethod
+    def gen_family_sizes(rng: np.random.Generator, population: tuple, count_family=100,
+                         weight_born=(55, 33, 9, 2, 1)) -> np.ndarray:
+        """
+        Генерация количества детей сразу для всех семей.
+
+        Использует AliasSampler, построенный один раз на профиль весов;
+        веса корректируются под диапазон так же, как в Family.incubator.
+
+        Returns
+        -------
+        np.ndarray
+            Количество детей в каждой семье.
+        """
+        return get_sampler(tuple(weight_born), tuple(population)).draw(rng, count_family)
+
+    def get_family_starts(self) -> np.ndarray:
+        """
+        Индекс первого ребенка каждой семьи в массивах населения.
+        """
+        return np.cumsum(self.family_sizes) - self.family_sizes
+
+    def get_birth_rank(self) -> np.ndarray:
+        """
+        Порядок рождения внутри семьи через сортировку по (семья, дата рождения).
+
+        Returns
+        -------
+        np.ndarray
+            Ранг ребенка в семье, 0 - старший.
+        """
+        order = np.lexsort((self.birth_ordinal, self.family_id))
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order)) - self.get_family_starts()[self.family_id[order]]
+        return rank
+
+    def sibling_order(self) -> dict:
+        """
+        Счетчики старших и младших братьев и сестер, как older/younger у Child.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            Массивы "older_brother", "older_sister", "younger_brother", "younger_sister".
+        """
+        return sibling_order(self.family_id, self.sex, self.birth_ordinal)
+
+    def nbytes(self) -> int:
+        """
+        Объем памяти, занимаемый массивами населения, в байтах.
+        """
+        return sum(array.nbytes for array in (self.family_sizes, self.family_id, self.sex,
+                                              self.birth_ordinal, self.birth_rank, self.sibling_count))
+
+    def children_count(self) -> int:
+        """
+        Общее количество детей.
+        """
+        return len(self.family_id)
+
+    def get_value_family(self) -> tuple:
+        """
+        Подсчет количества семей по числу детей.
+
+        Returns
+        -------
+        tuple
+            Отсортированный кортеж (число детей, количество семей).
+        """
+        return self.count_values(self.family_sizes)
+
+    @staticmethod
+    def count_values(family_sizes: np.ndarray) -> tuple:
+        """
+        Гистограмма размеров семей в формате get_value_family.
+        """
+        values, counts = np.unique(family_sizes, return_counts=True)
+        return tuple(zip(values.tolist(), counts.tolist()))
+
+    def chance_singleton_child(self) -> float:
+        """
+        Вероятность, что ребенок единственный в семье.
+
+        Returns
+        -------
+        float
+            Процент детей-одиночек.
+        """
+        single_family = self.get_value_family()[0][-1]
+        return round(single_family / self.children_count() * 100, 2)
+
+    def chance_sibling_child(self) -> float:
+        """
+        Вероятность, что ребенок имеет хотя бы одного брата или сестру.
+
+        Returns
+        -------
+        float
+            Процент детей с братьями или сестрами.
+        """
+        large_family = self.children_count() - self.get_value_family()[0][-1]
+        return round(large_family / self.children_count() * 100, 2)
+
+    def get_child_distribution(self):
+        child_distribution = {"Дети без братьев и сестер": self.chance_singleton_child(),
+                              "Дети c братьями и сестрами": self.chance_sibling_child()}
+        return child_distribution
@@ -0,0 +1,114 @@
+import threading
+from collections import OrderedDict
+from Experiments.metrics import timer
+from .Population import Population
+
+
+class PopulationCache:
+    """
+    LRU-кэш сгенерированных населений в памяти процесса.
+
+    Ключ - (веса, количество семей, сид). Размер ограничен суммарным объемом
+    массивов населений в байтах, при превышении вытесняются давно не использованные.
+    Запрос с seed=None получает общее население профиля, сгенерированное один раз.
+
+    Attributes
+    ----------
+    max_bytes : int
+        Предел суммарного объема массивов.
+    nbytes : int
+        Текущий объем массивов в кэше.
+    hits : int
+        Количество попаданий.
+    misses : int
+        Количество промахов (генераций).
+    """
+
+    def __init__(self, max_bytes=256 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(weights, count_family, seed) -> tuple:
+        """
+        Нормализованный ключ: веса приводятся к float, чтобы (55, 33) и (55.0, 33.0) совпадали.
+        """
+        return tuple(float(weight) for weight in weights), int(count_family), seed
+
+    def get(self, weights, count_family=100, seed=None) -> Population:
+        """
+        Население из кэша или новое, если его там нет.
+
+        Parameters
+        ----------
+        weights : tuple
+            Веса для генерации количества детей в семье.
+        count_family : int, optional
+            Количество семей, по умолчанию 100.
+        seed : int | None, optional
+            Сид генерации, None - общее население профиля.
+
+        Returns
+        -------
+        Population
+            Население (общий объект, изменять его нельзя).
+        """
+        key = self.get_key(weights, count_family, seed)
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        with timer("playground", "generation"):
+            population = Population(weights_born=weights, count_family=count_family, seed=seed)
+        with self._lock:
+            if key not in self._data:
+                self._data[key] = population
+                self.nbytes += population.nbytes()
+                self.evict()
+        return population
+
+    def evict(self):
+        """
+        Вытеснение давно не использованных населений до предела max_bytes.
+        Последнее добавленное население остается, даже если оно одно больше предела.
+        """
+        while self.nbytes > self.max_bytes and len(self._data) > 1:
+            _, population = self._data.popitem(last=False)
+            self.nbytes -= population.nbytes()
+
+    def clear(self):
+        """
+        Очистка кэша и счетчиков.
+        """
+        with self._lock:
+            self._data.clear()
+            self.nbytes = self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Счетчики кэша.
+
+        Returns
+        -------
+        dict
+            Попадания, промахи, доля попаданий, количество населений и их объем в байтах.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "size": len(self._data),
+            "nbytes": self.nbytes,
+            "max_bytes": self.max_bytes
+        }
+
+
+population_cache = PopulationCache()
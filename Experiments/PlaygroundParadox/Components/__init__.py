@@ -1,2 +1,5 @@
 from .casino_terminal import casino, gen_random_weight, get_random_value
 from .ChildHouse import ChildHouse
+from .AliasSampler import AliasSampler, get_sampler
+from .Population import Population
+from .PopulationCache import PopulationCache, population_cache
@@ -1,4 +1,20 @@
-from .casino_games.BloodTiles import BloodTiles
+import asyncio
+import random
+import time
+import numpy as np
+from Experiments.executor import run_in_pool, run_sharded, spawn_seeds
+from Experiments.estimates import progress_stream, adaptive_run, get_target_se
+from Experiments.metrics import count_trials
+from .Components import population_cache
+from .casino_games.BloodTiles import BloodTiles, exact_connect
+
+shard_min = 50_000  # Минимум симуляций в одном шарде
+engines = {"python": BloodTiles.count_connect, "numpy": BloodTiles.count_connect_numpy}
+modes = ("exact", "simulate", "adaptive")  # Точный расчет, Монте-Карло или Монте-Карло до заданной точности
+curve_modes = modes[:2]  # Кривая считается точно или Монте-Карло
+exact_max_value = 1_000  # Предел размера группы в точном расчете
+exact_max_family = 10 ** 6  # Предел количества семей в точном расчете
+
 
 def blood_tiles(post_data):
     blood_experiment = BloodTiles()
@@ -6,7 +22,134 @@ def blood_tiles(post_data):
     return get_data
 
 
+def valid_data(count_sim, value, num_of_family) -> bool:
+    """Проверка количества симуляций, размера группы и количества семей до генерации населения
+    (размер группы сверху ограничен количеством детей, оно проверяется после генерации)"""
+    return count_sim > 0 and value > 0 and num_of_family > 0
+
+
+def valid_exact(value, num_of_family) -> bool:
+    """Ограничение размера группы и населения для точного расчета"""
+    return value <= exact_max_value and num_of_family <= exact_max_family
+
+
+def get_seeds(seed):
+    """Сиды населения и симуляции из сида запроса
+    без seed берется общее для профиля население из population_cache"""
+    if seed is None:
+        return None, None
+    population_seed, sim_seed = spawn_seeds(seed, 2)
+    return population_seed, sim_seed
+
+
+async def get_population(weight, num_of_family, seed):
+    """Население из population_cache, генерация вне event loop"""
+    return await asyncio.to_thread(population_cache.get, weight, num_of_family, seed)
+
+
+async def blood_tiles_exact(post_data):
+    """Точная вероятность родства по гистограмме размеров семей, кэшируется по гистограмме
+    население берется то же, что и в blood_tiles_parallel, что позволяет сверять режимы"""
+    population_seed, _ = get_seeds(post_data.seed)
+    population = await get_population(post_data.weight, post_data.num_of_family, population_seed)
+    return await run_in_pool(BloodTiles.start_exact, post_data, population.get_value_family())
+
+
+async def get_family_ids(weight, num_of_family, seed):
+    """Номера семей всех детей населения из population_cache, генерация вне event loop"""
+    population = await get_population(weight, num_of_family, seed)
+    return population.family_id
+
+
+def blood_tiles_shard(count_sim, seed, family_ids, value, engine="numpy"):
+    """Шард для пула процессов: количество групп с родственниками"""
+    rng = np.random.default_rng(seed) if engine == "numpy" else random.Random(seed)
+    return engines[engine](family_ids, value, count_sim, rng)
+
+
+async def blood_tiles_parallel(post_data):
+    """blood_tiles в пуле процессов: население берется из population_cache,
+    симуляции делятся на шарды с под-сидами от post_data.seed"""
+    population_seed, sim_seed = get_seeds(post_data.seed)
+    family_ids = await get_family_ids(post_data.weight, post_data.num_of_family, population_seed)
+    if post_data.value > len(family_ids):
+        raise ValueError(f"Размер группы {post_data.value} больше количества детей {len(family_ids)}")
+    start = time.perf_counter()
+    counter = await run_sharded(blood_tiles_shard, post_data.count_sim, sum, family_ids, post_data.value,
+                                post_data.engine, seed=sim_seed, min_size=shard_min)
+    count_trials("playground", post_data.count_sim, time.perf_counter() - start)
+    return {"result": round(counter / post_data.count_sim * 100, 2)}
+
+
+async def blood_tiles_stream(post_data):
+    """blood_tiles с промежуточными оценками для потокового ответа:
+    население проверяется до начала потока, симуляции идут блоками в одном потоке
+    возвращает генератор строк progress_stream с величиной result"""
+    population_seed, sim_seed = get_seeds(post_data.seed)
+    family_ids = await get_family_ids(post_data.weight, post_data.num_of_family, population_seed)
+    if post_data.value > len(family_ids):
+        raise ValueError(f"Размер группы {post_data.value} больше количества детей {len(family_ids)}")
+    rng = np.random.default_rng(sim_seed) if post_data.engine == "numpy" else random.Random(sim_seed)
+    count_connect = engines[post_data.engine]
+
+    def draw(size):
+        return {"result": count_connect(family_ids, post_data.value, size, rng)}
+
+    return progress_stream(draw, post_data.count_sim, every=post_data.every, interval=post_data.interval)
+
+
+def blood_tiles_adaptive_run(family_ids, value, engine, seed, target_se, budget):
+    """Симуляции растущими блоками до целевой стандартной ошибки или конца бюджета времени
+    (функция верхнего уровня, чтобы ее можно было передать в пул процессов)"""
+    rng = np.random.default_rng(seed) if engine == "numpy" else random.Random(seed)
+
+    def draw(size):
+        return {"result": engines[engine](family_ids, value, size, rng)}
+
+    return adaptive_run(draw, target_se, budget=budget)
+
+
+async def blood_tiles_adaptive(post_data):
+    """blood_tiles до заданной точности: вместо count_sim задается target_se или target_ci
+    и бюджет времени, в ответе - оценка, ее ошибка и количество понадобившихся симуляций"""
+    population_seed, sim_seed = get_seeds(post_data.seed)
+    family_ids = await get_family_ids(post_data.weight, post_data.num_of_family, population_seed)
+    if post_data.value > len(family_ids):
+        raise ValueError(f"Размер группы {post_data.value} больше количества детей {len(family_ids)}")
+    update = await run_in_pool(blood_tiles_adaptive_run, family_ids, post_data.value, post_data.engine, sim_seed,
+                               get_target_se(post_data.target_se, post_data.target_ci), post_data.time_budget)
+    count_trials("playground", update["trials"], update["time"])
+    return {key: update[key] for key in ("result", "result_SE", "result_CI", "trials", "time", "target_reached")}
+
+
+def curve_shard(count_sim, seed, family_ids, max_value):
+    """Шард для пула процессов: количество групп с родственниками для всех размеров 0..max_value"""
+    return BloodTiles.count_connect_curve(family_ids, max_value, count_sim, np.random.default_rng(seed))
+
+
+def curve_response(counter, data):
+    """Кривая в формате ответа: размеры групп min_value..max_value и проценты"""
+    values = list(range(data.min_value, data.max_value + 1))
+    return {"values": values, "result": [round(float(counter[n]), 2) for n in values]}
 
 
+async def blood_tiles_curve_exact(data):
+    """Точная кривая вероятности родства по гистограмме одного населения"""
+    population_seed, _ = get_seeds(data.seed)
+    population = await get_population(data.weight, data.num_of_family, population_seed)
+    curve = await run_in_pool(exact_connect, population.get_value_family(), data.max_value)
+    return curve_response(curve, data)
 
 
+async def blood_tiles_curve_parallel(data):
+    """Кривая вероятности родства Монте-Карло по одному населению:
+    выборки размера max_value дают все меньшие размеры своими префиксами"""
+    population_seed, sim_seed = get_seeds(data.seed)
+    family_ids = await get_family_ids(data.weight, data.num_of_family, population_seed)
+    if data.max_value > len(family_ids):
+        raise ValueError(f"Размер группы {data.max_value} больше количества детей {len(family_ids)}")
+    start = time.perf_counter()
+    counter = await run_sharded(curve_shard, data.count_sim, sum, family_ids, data.max_value,
+                                seed=sim_seed, min_size=shard_min)
+    count_trials("playground", data.count_sim, time.perf_counter() - start)
+    return curve_response(counter / data.count_sim * 100, data)
@@ -1,6 +1,24 @@
-from fastapi import APIRouter, HTTPException
-from Models.PlaygroundParadox.BloodTiles import BloodTilesData
-from .Logic import blood_tiles
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from Models.PlaygroundParadox.BloodTiles import BloodTilesData, BloodTilesStreamData, BloodTilesCurveData
+from Experiments.result_cache import result_cache
+from Experiments.etag import static_response
+from Experiments.metrics import ndjson_lines
+from Experiments.estimates import valid_target
+from .Components import population_cache
+from .Logic import (
+    blood_tiles_parallel,
+    blood_tiles_exact,
+    blood_tiles_stream,
+    blood_tiles_adaptive,
+    blood_tiles_curve_parallel,
+    blood_tiles_curve_exact,
+    valid_data,
+    valid_exact,
+    engines,
+    modes,
+    curve_modes
+)
 
 rules = """# 👨‍👩‍👧‍👦 Парадокс детской площадки
 ### Почему мир кажется многодетным, когда статистика говорит об обратном?
@@ -29,15 +47,86 @@ router = APIRouter(
 )
 
 
+def bad_request(msg="Данные не прошли валидацию"):
+    """Ответ о непрошедшей валидации в общем формате {"status": "Bad", ...} с кодом 400"""
+    return JSONResponse(status_code=400, content={
+        "status": "Bad",
+        "error": "400",
+        "name_error": "bad request",
+        "msg": msg
+    })
+
+
 @router.get("/info")
-def info():
-    return {
+def info(request: Request):
+    return static_response(request, {
         "status": "Good",
         "rules": rules
-    }
+    })
+
+
+@router.get("/population_cache")
+def population_cache_stats():
+    return population_cache.stats()
 
 
 @router.post("/start_blood_tiles")
-def start_blood_tiles(post_data: BloodTilesData):
-    result_data = blood_tiles(post_data)
+async def start_blood_tiles(post_data: BloodTilesData):
+    if post_data.engine not in engines or post_data.mode not in modes:
+        return bad_request(f"Неизвестный режим: {post_data.mode}/{post_data.engine}")
+    if not valid_data(post_data.count_sim, post_data.value, post_data.num_of_family):
+        return bad_request()
+    if post_data.mode == "adaptive" and not valid_target(post_data.target_se, post_data.target_ci,
+                                                         post_data.time_budget):
+        return bad_request("Не задана целевая точность или бюджет времени")
+    if post_data.mode == "exact" and not valid_exact(post_data.value, post_data.num_of_family):
+        return bad_request("Слишком большая группа или население для точного расчета")
+
+    async def compute():
+        if post_data.mode == "exact":
+            return await blood_tiles_exact(post_data)
+        if post_data.mode == "adaptive":
+            return await blood_tiles_adaptive(post_data)
+        return await blood_tiles_parallel(post_data)
+
+    try:
+        result_data = await result_cache.get_or_compute(result_cache.make_key("playground/start_blood_tiles",
+                                                                              post_data), compute)
+    except ValueError as error:
+        return bad_request(str(error))
+    return result_data
+
+
+@router.post("/start_blood_tiles_stream")
+async def start_blood_tiles_stream(post_data: BloodTilesStreamData):
+    if post_data.engine not in engines or min(post_data.every, post_data.interval) <= 0:
+        return bad_request()
+    if not valid_data(post_data.count_sim, post_data.value, post_data.num_of_family):
+        return bad_request()
+    try:
+        rows = await blood_tiles_stream(post_data)
+    except ValueError as error:
+        return bad_request(str(error))
+    return StreamingResponse(ndjson_lines(rows, "playground"), media_type="application/x-ndjson")
+
+
+@router.post("/blood_tiles_curve")
+async def blood_tiles_curve(post_data: BloodTilesCurveData):
+    if post_data.mode not in curve_modes or not 0 < post_data.min_value <= post_data.max_value:
+        return bad_request()
+    if not valid_data(post_data.count_sim, post_data.max_value, post_data.num_of_family):
+        return bad_request()
+    if post_data.mode == "exact" and not valid_exact(post_data.max_value, post_data.num_of_family):
+        return bad_request("Слишком большая группа или население для точного расчета")
+
+    async def compute():
+        if post_data.mode == "exact":
+            return await blood_tiles_curve_exact(post_data)
+        return await blood_tiles_curve_parallel(post_data)
+
+    try:
+        result_data = await result_cache.get_or_compute(result_cache.make_key("playground/blood_tiles_curve",
+                                                                              post_data), compute)
+    except ValueError as error:
+        return bad_request(str(error))
     return result_data
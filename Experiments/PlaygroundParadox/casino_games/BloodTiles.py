@@ -1,8 +1,57 @@
 import random
-from Experiments.PlaygroundParadox.Components import ChildHouse
+from functools import lru_cache
+import numpy as np
+from Experiments.metrics import timer
+from Experiments.PlaygroundParadox.Components import population_cache
+
+
+def log_comb(n, k: np.ndarray) -> np.ndarray:
+    """Логарифмы C(n, k) для k = 0, 1, 2, ... по порядку (через накопленные суммы логарифмов)"""
+    factor = np.log(n - k[1:] + 1.0) - np.log(k[1:].astype(float))
+    return np.concatenate(([0.0], np.cumsum(factor)))
+
+
+def log_convolve(left: np.ndarray, right: np.ndarray, size) -> np.ndarray:
+    """Свертка многочленов, заданных логарифмами коэффициентов, с обрезкой до степени size
+    сумма по j считается через log-sum-exp, нулевые коэффициенты - это -inf"""
+    index = np.arange(size + 1)[:, None] - np.arange(len(right))[None, :]
+    terms = np.where(index >= 0, left[np.clip(index, 0, None)] + right[None, :], -np.inf)
+    peak = terms.max(axis=1)
+    with np.errstate(invalid="ignore"):
+        total = peak + np.log(np.exp(terms - peak[:, None]).sum(axis=1))
+    return np.where(np.isfinite(peak), total, -np.inf)
+
+
+@lru_cache(maxsize=1024)
+def log_no_relative(histogram: tuple, value: int) -> np.ndarray:
+    """Логарифм вероятности, что в группе нет родственников, для размеров группы 0..value
+
+    e_n - коэффициент при x^n многочлена prod (1 + k*x)^h_k по гистограмме
+    ((k, h_k), ...) из get_value_family, число способов выбрать n детей из разных семей;
+    вероятность равна e_n / C(M, n), где M - количество детей. Многочлены перемножаются
+    в логарифмах с обрезкой до степени value, поэтому большие числа не появляются."""
+    total = sum(size * count for size, count in histogram)
+    coeffs = np.full(value + 1, -np.inf)
+    coeffs[0] = 0.0
+    for size, count in histogram:
+        degree = np.arange(min(count, value) + 1)
+        coeffs = log_convolve(coeffs, log_comb(count, degree) + degree * np.log(size), value)
+    return coeffs - log_comb(total, np.arange(value + 1))
+
+
+def exact_connect(histogram: tuple, value: int) -> np.ndarray:
+    """Точная вероятность родства в группе (обобщенный парадокс дней рождения)
+    для размеров группы 0..value, в процентах: 1 - e_n / C(M, n)
+    (ошибка округления в логарифмах не дает отрицательных процентов)"""
+    total = sum(size * count for size, count in histogram)
+    if value > total:
+        raise ValueError(f"Размер группы {value} больше количества детей {total}")
+    with timer("playground", "scoring"):
+        return np.maximum(-np.expm1(log_no_relative(histogram, value)), 0.0) * 100
 
 
 class BloodTiles:
+    chunk_cells = 1 << 22  # Предел ячеек матрицы выборок в одном блоке
 
     @staticmethod
     def family_connect(child_list: list):
@@ -14,10 +63,98 @@ class BloodTiles:
                 check.append(child.second_name)
         return False
 
+    @staticmethod
+    def count_connect(family_ids, value, count_sim, rng: random.Random):
+        """Количество групп из value детей (по номерам семей), в которых есть родственники"""
+        family_ids = list(family_ids)
+        counter = 0
+        for _ in range(count_sim):
+            if len(set(rng.sample(family_ids, value))) < value:
+                counter += 1
+        return counter
+
+    @staticmethod
+    def has_duplicates(matrix: np.ndarray) -> np.ndarray:
+        """Есть ли повторяющиеся значения в каждой строке матрицы (через сортировку строк)"""
+        matrix = np.sort(matrix, axis=1)
+        return (matrix[:, 1:] == matrix[:, :-1]).any(axis=1)
+
+    @classmethod
+    def sample_groups(cls, rng: np.random.Generator, population_size, count_sim, value) -> np.ndarray:
+        """Матрица count_sim x value индексов детей, в каждой строке индексы без повторов
+        в случайном порядке, поэтому первые n столбцов - тоже выборка из n детей
+
+        При value**2 <= population_size повторы редки: строки берутся с возвращением
+        и перевыбираются, пока в них есть повторы. Иначе строка - первые value
+        элементов случайной перестановки (argpartition по случайным ключам)."""
+        if value * value <= population_size:
+            groups = rng.integers(population_size, size=(count_sim, value))
+            repeat = cls.has_duplicates(groups)
+            while repeat.any():
+                groups[repeat] = rng.integers(population_size, size=(int(repeat.sum()), value))
+                repeat[repeat] = cls.has_duplicates(groups[repeat])
+            return groups
+        keys = rng.random((count_sim, population_size))
+        groups = np.argpartition(keys, value - 1, axis=1)[:, :value]
+        # порядок по ключам делает каждый префикс строки тоже случайной выборкой
+        order = np.argsort(np.take_along_axis(keys, groups, axis=1), axis=1)
+        return np.take_along_axis(groups, order, axis=1)
+
+    @classmethod
+    def count_connect_numpy(cls, family_ids, value, count_sim, rng: np.random.Generator):
+        """Векторный вариант count_connect: все группы сразу матрицей номеров семей,
+        родство - повтор номера семьи в строке. Строки обрабатываются блоками по chunk_cells ячеек"""
+        family_ids = np.asarray(family_ids)
+        width = value if value * value <= len(family_ids) else len(family_ids)
+        step = max(1, cls.chunk_cells // width)
+        counter = 0
+        for start in range(0, count_sim, step):
+            size = min(step, count_sim - start)
+            with timer("playground", "sampling"):
+                groups = cls.sample_groups(rng, len(family_ids), size, value)
+            with timer("playground", "scoring"):
+                counter += int(np.count_nonzero(cls.has_duplicates(family_ids[groups])))
+        return counter
+
     @staticmethod
     def get_class(all_children, value):
         return random.sample(all_children, value)
 
+    @staticmethod
+    def first_connect(family_groups: np.ndarray) -> np.ndarray:
+        """Позиция первого ребенка в каждой строке, у которого раньше в строке есть брат или сестра,
+        или ширина строки, если родственников нет. Группа из первых n детей строки
+        содержит родственников тогда и только тогда, когда first_connect < n"""
+        order = np.argsort(family_groups, axis=1, kind="stable")
+        families = np.take_along_axis(family_groups, order, axis=1)
+        repeat = families[:, 1:] == families[:, :-1]
+        position = np.where(repeat, order[:, 1:], family_groups.shape[1])
+        return position.min(axis=1, initial=family_groups.shape[1])
+
+    @classmethod
+    def count_connect_curve(cls, family_ids, max_value, count_sim, rng: np.random.Generator):
+        """Кривая count_connect_numpy для всех размеров группы 0..max_value сразу:
+        строки размера max_value дают и все меньшие группы своими префиксами
+        возвращает массив количества групп с родственниками для каждого размера"""
+        family_ids = np.asarray(family_ids)
+        width = max_value if max_value * max_value <= len(family_ids) else len(family_ids)
+        step = max(1, cls.chunk_cells // width)
+        counter = np.zeros(max_value + 1, dtype=np.int64)
+        for start in range(0, count_sim, step):
+            size = min(step, count_sim - start)
+            with timer("playground", "sampling"):
+                groups = cls.sample_groups(rng, len(family_ids), size, max_value)
+            with timer("playground", "scoring"):
+                first = cls.first_connect(family_ids[groups])
+                # группа из n детей содержит родственников при first_connect <= n - 1
+                counter[1:] += np.cumsum(np.bincount(first, minlength=max_value + 1))[:max_value]
+        return counter
+
+    @staticmethod
+    def start_exact(post_data, value_family):
+        """Точный расчет по гистограмме размеров семей вместо Монте-Карло"""
+        return {"result": round(float(exact_connect(value_family, post_data.value)[post_data.value]), 2)}
+
     def start_simulate(self, post_data):
 
         weight = post_data.weight
@@ -25,20 +162,15 @@ class BloodTiles:
         count_sim = post_data.count_sim
         num_of_family = post_data.num_of_family
 
-        counter = 0
-
-        child_house = ChildHouse(weights_born=weight,
-                                 count_family=num_of_family
-                                 )
+        population = population_cache.get(weights=weight,
+                                          count_family=num_of_family
+                                          )
 
-        all_children = child_house.all_children_list
-
-        for _ in range(count_sim):
-            result = self.get_class(all_children=all_children,
-                                    value=value
-                                    )
-            if self.family_connect(result):
-                counter += 1
+        counter = self.count_connect_numpy(family_ids=population.family_id,
+                                           value=value,
+                                           count_sim=count_sim,
+                                           rng=np.random.default_rng()
+                                           )
 
         data = {"result": round(counter / count_sim * 100, 2)}
 
@@ -0,0 +1,298 @@
+import asyncio
+import math
+import os
+import re
+import tempfile
+import time
+import uuid
+import numpy as np
+from Experiments.executor import run_in_pool, run_sharded, spawn_seeds
+from Experiments.metrics import timer, count_trials
+
+max_cells = 10 ** 10  # Предел блужданий * шагов в одном запросе
+max_steps = 10 ** 7  # Наибольшая длина блуждания
+max_walks = 10 ** 6  # Предел блужданий: статистика хранится по каждому блужданию и пересылается из шардов
+chunk_cells = 1 << 22  # Шагов (блуждания * шаги) в одном векторном блоке
+shard_cells = 10 ** 7  # Минимум шагов в одном шарде
+max_stored = 10 ** 8  # Предел сохраняемых координат: траектории * (шаги + 1) * размерность
+max_files = 32  # Сколько последних файлов траекторий хранится на диске
+part_age = 3600  # Через сколько секунд недописанный файл .part считается брошенным
+page_points = 10_000  # Наибольшая страница траектории
+trajectory_dir = os.path.join(tempfile.gettempdir(), "random_walk")  # Каталог файлов траекторий
+axes = "xyz"
+positive_bins = 20  # Корзины гистограммы доли времени выше нуля
+quantiles = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+
+class WalkStats:
+    """
+    Онлайн-статистика блока блужданий по решетке Z^dim.
+
+    Шаги приходят кусками: накопленная сумма куска плюс текущая позиция дают
+    координаты, по которым обновляются счетчики, после чего кусок отбрасывается.
+    Память зависит только от количества блужданий и размера куска, но не от длины.
+
+    Attributes
+    ----------
+    position : np.ndarray
+        Текущие координаты блужданий, форма (walks, dim).
+    max_square : np.ndarray
+        Наибольший квадрат расстояния от начала координат.
+    first_passage : np.ndarray
+        Шаг первого достижения уровня level (-1, если не достигнут).
+    positive : np.ndarray
+        Шаги, на которых первая координата выше нуля (ребро S_{t-1}, S_t над осью).
+    returns : np.ndarray
+        Возвраты в начало координат.
+    steps : int
+        Сделано шагов.
+    """
+
+    def __init__(self, walks, dim=1, level=10):
+        self.dim = dim
+        self.level = level
+        self.position = np.zeros((walks, dim), dtype=np.int64)
+        self.max_square = np.zeros(walks, dtype=np.int64)
+        self.first_passage = np.full(walks, -1, dtype=np.int64)
+        self.positive = np.zeros(walks, dtype=np.int64)
+        self.returns = np.zeros(walks, dtype=np.int64)
+        self.steps = 0
+
+    def add_paths(self, paths: list[np.ndarray]):
+        """Обновление по куску траекторий: paths[a] - координата a, форма (walks, chunk)"""
+        square = sum(path ** 2 for path in paths)
+        self.max_square = np.maximum(self.max_square, square.max(axis=1))
+        self.returns += (square == 0).sum(axis=1)
+        # На решетке с шагом 1 уровень нельзя перепрыгнуть: в 1D это попадание в level,
+        # в 2D и 3D - первый выход из шара радиуса level
+        reached = paths[0] >= self.level if self.dim == 1 else square >= self.level ** 2
+        new = (self.first_passage < 0) & reached.any(axis=1)
+        self.first_passage[new] = self.steps + reached[new].argmax(axis=1) + 1
+        previous = np.c_[self.position[:, 0], paths[0][:, :-1]]
+        self.positive += ((paths[0] > 0) | (previous > 0)).sum(axis=1)
+        self.position = np.stack([path[:, -1] for path in paths], axis=1)
+        self.steps += paths[0].shape[1]
+
+    def result(self) -> dict:
+        """Итог по каждому блужданию"""
+        return {
+            "final": self.position,
+            "max_distance": np.sqrt(self.max_square),
+            "first_passage": self.first_passage,
+            "positive": self.positive,
+            "returns": self.returns
+        }
+
+
+def draw_paths(rng: np.random.Generator, position: np.ndarray, chunk) -> list[np.ndarray]:
+    """Кусок траекторий: на каждом шаге случайная ось и знак, координаты - накопленная сумма
+    шагов плюс текущая позиция; возвращает список координат формы (walks, chunk)"""
+    walks, dim = position.shape
+    sign = rng.integers(0, 2, size=(walks, chunk), dtype=np.int8) * 2 - 1
+    if dim == 1:
+        return [position[:, :1] + np.cumsum(sign, axis=1, dtype=np.int64)]
+    axis = rng.integers(0, dim, size=(walks, chunk), dtype=np.int8)
+    return [position[:, a:a + 1] + np.cumsum(np.where(axis == a, sign, 0), axis=1, dtype=np.int64)
+            for a in range(dim)]
+
+
+def simulate_walks(rng: np.random.Generator, walks, steps, dim=1, level=10, store=None) -> dict:
+    """Блуждания блоками по блужданиям и кускам по шагам, в каждом куске не больше chunk_cells шагов
+    store - массив формы (walks, steps + 1, dim) для сохранения полных траекторий"""
+    rows = max(1, min(walks, chunk_cells // min(steps, chunk_cells)))
+    chunk = max(1, chunk_cells // rows)
+    results = []
+    for start in range(0, walks, rows):
+        stats = WalkStats(min(rows, walks - start), dim, level)
+        while stats.steps < steps:
+            size = min(chunk, steps - stats.steps)
+            with timer("random_walk", "sampling"):
+                paths = draw_paths(rng, stats.position, size)
+            if store is not None:
+                with timer("random_walk", "serialization"):
+                    for a, path in enumerate(paths):
+                        store[start:start + len(path), stats.steps + 1:stats.steps + 1 + size, a] = path
+            with timer("random_walk", "scoring"):
+                stats.add_paths(paths)
+        results.append(stats.result())
+    return merge_walks(results)
+
+
+def merge_walks(results: list[dict]) -> dict:
+    """Объединение статистики блоков или шардов по блужданиям"""
+    return {key: np.concatenate([result[key] for result in results]) for key in results[0]}
+
+
+def shard_walks(walks, seed, steps, dim, level):
+    """Шард для пула процессов: статистика walks блужданий"""
+    return simulate_walks(np.random.default_rng(seed), walks, steps, dim, level)
+
+
+def get_path(run_id) -> str:
+    """Путь к файлу траекторий; run_id - 32 шестнадцатеричных символа, иначе ValueError"""
+    if not re.fullmatch(r"[0-9a-f]{32}", run_id):
+        raise ValueError("Неверный идентификатор траекторий")
+    return os.path.join(trajectory_dir, run_id + ".npy")
+
+
+def remove_file(path):
+    """Удаление файла; файл мог уже удалить другой процесс пула"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def prune_trajectories():
+    """Удаление старых файлов траекторий сверх max_files и брошенных файлов .part
+    (расчет упал или процесс остановлен), файлы могут одновременно удалять несколько процессов"""
+    now = time.time()
+    files = []
+    for entry in os.scandir(trajectory_dir):
+        try:
+            mtime = entry.stat().st_mtime
+        except FileNotFoundError:
+            continue
+        if entry.name.endswith(".npy.part") and now - mtime > part_age:
+            remove_file(entry.path)
+        elif entry.name.endswith(".npy"):
+            files.append((mtime, entry.path))
+    for _, path in sorted(files)[:-max_files]:
+        remove_file(path)
+
+
+def store_walks(run_id, walks, steps, dim, level, seed) -> dict:
+    """Блуждания с сохранением полных траекторий в memory-mapped файл .npy формы (walks, steps + 1, dim)
+    файл пишется кусками по мере расчета и читается постранично через read_page"""
+    os.makedirs(trajectory_dir, exist_ok=True)
+    prune_trajectories()
+    path = get_path(run_id)
+    try:
+        store = np.lib.format.open_memmap(path + ".part", mode="w+", dtype=np.int32, shape=(walks, steps + 1, dim))
+        store[:, 0] = 0
+        result = simulate_walks(np.random.default_rng(seed), walks, steps, dim, level, store)
+        store.flush()
+        del store
+        os.replace(path + ".part", path)
+    except BaseException:
+        remove_file(path + ".part")
+        raise
+    return result
+
+
+def read_page(run_id, walk=0, start=0, length=1000, stride=1) -> dict:
+    """Страница сохраненной траектории: точки start, start + stride, ... (не больше page_points)"""
+    path = get_path(run_id)
+    if not os.path.exists(path):
+        raise FileNotFoundError("Траектории не найдены или уже удалены")
+    store = np.load(path, mmap_mode="r")
+    walks, points, dim = store.shape
+    if not (0 <= walk < walks and 0 <= start < points and 0 < length <= page_points and stride > 0):
+        raise ValueError("Страница вне траектории")
+    page = np.asarray(store[walk, start:start + length * stride:stride])
+    result = {"run_id": run_id, "walk": walk, "walks": walks, "steps": points - 1,
+              "start": start, "stride": stride, "index": list(range(start, start + len(page) * stride, stride))}
+    for a in range(dim):
+        result[axes[a]] = page[:, a].tolist()
+    return result
+
+
+def return_probabilities(steps, dim=1) -> np.ndarray | None:
+    """Точные вероятности P(S_2m = 0), m = 1..steps/2 для 1D и 2D
+    u_m = C(2m, m) / 4^m = prod (2j - 1) / 2j; в 2D (поворот решетки на 45°) - u_m^2"""
+    if dim > 2:
+        return None
+    m = np.arange(1, steps // 2 + 1)
+    u = np.cumprod((2 * m - 1) / (2 * m))
+    return u if dim == 1 else u ** 2
+
+
+def final_distribution(steps, values: np.ndarray) -> list[float]:
+    """Точная вероятность конечной позиции k в 1D: C(n, (n + k) / 2) / 2^n, через логарифм гаммы"""
+    probabilities = []
+    for k in values.tolist():
+        if (steps + k) % 2 or abs(k) > steps:
+            probabilities.append(0.0)
+            continue
+        right = (steps + k) // 2
+        log_p = math.lgamma(steps + 1) - math.lgamma(right + 1) - math.lgamma(steps - right + 1) - steps * math.log(2)
+        probabilities.append(round(math.exp(log_p), 8))
+    return probabilities
+
+
+def describe(values: np.ndarray) -> dict:
+    """Среднее и квантили величины"""
+    row = {"mean": round(float(values.mean()), 4)}
+    for name, q in quantiles.items():
+        row[name] = round(float(np.quantile(values, q)), 4)
+    return row
+
+
+def summarize(walks: dict, steps, dim, level) -> dict:
+    """Сводка по всем блужданиям вместе с точными значениями, где они известны"""
+    final = walks["final"]
+    square = (final ** 2).sum(axis=1)
+    result = {"final": {"mean_square": round(float(square.mean()), 4), "exact_mean_square": steps}}
+    if dim == 1:
+        values, counts = np.unique(final[:, 0], return_counts=True)
+        result["final"].update({"mean": round(float(final.mean()), 4), "positions": values.tolist(),
+                                "counts": counts.tolist(), "exact": final_distribution(steps, values)})
+    else:
+        distance = np.sqrt(square)
+        counts, edges = np.histogram(distance, bins=50)
+        result["final"].update({"distance": describe(distance),
+                                "histogram": {"edges": edges.round(2).tolist(), "counts": counts.tolist()}})
+    result["max_distance"] = describe(walks["max_distance"])
+    passage = walks["first_passage"]
+    reached = passage[passage >= 0]
+    result["first_passage"] = {"level": level, "reached": round(float(len(reached) / len(passage)), 6)}
+    if len(reached):
+        result["first_passage"].update(describe(reached))
+    share = walks["positive"] / steps
+    counts, edges = np.histogram(share, bins=positive_bins, range=(0, 1))
+    result["time_positive"] = {
+        "edges": edges.round(4).tolist(),
+        "counts": counts.tolist(),
+        # Закон арксинуса: P(доля <= x) -> 2/π * arcsin(sqrt(x))
+        "arcsine": np.diff(2 / np.pi * np.arcsin(np.sqrt(edges))).round(6).tolist()
+    }
+    probabilities = return_probabilities(steps, dim)
+    result["returns"] = {"mean": round(float(walks["returns"].mean()), 4),
+                         "exact_mean": round(float(probabilities.sum()), 4) if probabilities is not None else None}
+    return result
+
+
+def valid_data(data) -> bool:
+    """Проверка размерности, количества блужданий, шагов и сохраняемых траекторий"""
+    first = data.dim in (1, 2, 3) and 0 < data.walks <= max_walks and 0 < data.steps <= max_steps
+    second = data.walks * data.steps <= max_cells and data.level > 0
+    third = 0 <= data.keep <= data.walks and data.keep * (data.steps + 1) * data.dim <= max_stored
+    return first and second and third
+
+
+async def random_walk(data) -> dict:
+    """Первые keep блужданий считаются с сохранением траекторий, остальные - шардами в пуле процессов"""
+    start = time.perf_counter()
+    keep_seed, seed = spawn_seeds(data.seed, 2)
+    run_id = uuid.uuid4().hex if data.keep else None
+    tasks = []
+    if data.keep:
+        tasks.append(run_in_pool(store_walks, run_id, data.keep, data.steps, data.dim, data.level, keep_seed))
+    if data.walks > data.keep:
+        tasks.append(run_sharded(shard_walks, data.walks - data.keep, merge_walks, data.steps, data.dim, data.level,
+                                 seed=seed, min_size=max(1, shard_cells // data.steps)))
+    parts = await asyncio.gather(*tasks)
+    walks = merge_walks(parts)
+    seconds = time.perf_counter() - start
+    count_trials("random_walk", data.walks, seconds)
+    with timer("random_walk", "scoring"):
+        result = summarize(walks, data.steps, data.dim, data.level)
+    result.update({"walks": data.walks, "steps": data.steps, "dim": data.dim, "time": round(seconds, 4)})
+    if run_id is not None:
+        result["trajectories"] = {
+            "run_id": run_id,
+            "walks": data.keep,
+            "final": walks["final"][:data.keep].tolist(),
+            "max_distance": walks["max_distance"][:data.keep].round(4).tolist()
+        }
+    return result
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, HTTPException, Request
+from Models.Random_Walk import RandomWalkData
+from Experiments.result_cache import result_cache
+from Experiments.etag import static_response
+from .Logic import (
+    random_walk,
+    read_page,
+    valid_data
+)
+
+rules = """# 🚶 Случайное блуждание
+### Куда уйдет точка, если каждый шаг выбирать подбрасыванием монетки?
+
+---
+
+Точка начинает движение в нуле и на каждом шаге смещается на **+1** или **−1**
+(на плоскости и в пространстве — вдоль случайно выбранной оси).
+
+* Средняя позиция остается в нуле, а средний **квадрат** расстояния равен числу шагов **n**:
+  точка уходит примерно на **√n**.
+* По **закону арксинуса** доля времени выше нуля чаще всего близка к **0** или **1**, а не к половине.
+* На прямой и на плоскости точка рано или поздно вернется в начало, а в пространстве — только с вероятностью около **34%**.
+"""
+
+router = APIRouter(
+    prefix="/random_walk",
+    tags=["RandomWalk"]
+)
+
+
+@router.get("/info")
+def info(request: Request):
+    return static_response(request, {
+        "status": "Good",
+        "rules": rules
+    })
+
+
+@router.post("/simulate")
+async def random_walk_simulate(data: RandomWalkData):
+    if not valid_data(data):
+        raise HTTPException(status_code=400, detail="Данные не прошли валидацию")
+
+    if data.keep:
+        # Файл траекторий может быть удален раньше, чем истечет TTL кэша, поэтому такие ответы не кэшируются
+        return await random_walk(data)
+
+    async def compute():
+        return await random_walk(data)
+
+    return await result_cache.get_or_compute(result_cache.make_key("random_walk/simulate", data), compute)
+
+
+@router.get("/trajectory/{run_id}")
+def random_walk_trajectory(run_id: str, walk: int = 0, start: int = 0, length: int = 1000, stride: int = 1):
+    try:
+        return read_page(run_id, walk, start, length, stride)
+    except FileNotFoundError as error:
+        raise HTTPException(status_code=404, detail=str(error))
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
@@ -0,0 +1,154 @@
+import math
+import time
+import numpy as np
+from Experiments.metrics import timer, count_trials
+
+chunk_size = 1 << 20  # Игр в одном векторном блоке движка geometric
+max_flips = 64  # Подбрасываний в явных корзинах multinomial, более длинные игры добираются геометрически
+max_games = {"geometric": 10 ** 9, "multinomial": 10 ** 12}  # Предел игр для каждого движка
+max_checkpoints = 200  # Предел контрольных точек траектории среднего
+quantiles = {"p50": 0.5, "p90": 0.9, "p99": 0.99, "p999": 0.999}  # Квантили выигрыша в строках траектории
+engines = ("geometric", "multinomial")
+
+
+class PayoffHistogram:
+    """
+    Онлайн-статистика игр Санкт-Петербурга в постоянной памяти.
+
+    Выигрыш игры с n подбрасываниями равен 2^n, поэтому счетчики по n - это
+    гистограмма выигрышей с логарифмическими (log2) корзинами и одновременно точный
+    скетч квантилей: носитель распределения дискретный. Сумма выигрышей считается
+    целыми числами Python, поэтому не переполняется.
+
+    Attributes
+    ----------
+    counts : np.ndarray
+        Количество игр по числу подбрасываний n (индекс - n).
+    games : int
+        Сыграно игр.
+    """
+
+    def __init__(self):
+        self.counts = np.zeros(max_flips + 2, dtype=np.int64)
+        self.games = 0
+
+    def add_counts(self, counts: np.ndarray):
+        """Добавление счетчиков игр по числу подбрасываний, массив растет при редких длинных играх"""
+        if len(counts) > len(self.counts):
+            self.counts = np.r_[self.counts, np.zeros(len(counts) - len(self.counts), dtype=np.int64)]
+        self.counts[:len(counts)] += counts
+        self.games += int(counts.sum())
+
+    def add_flips(self, flips: np.ndarray):
+        """Добавление блока игр, заданных числом подбрасываний"""
+        self.add_counts(np.bincount(flips))
+
+    def total(self) -> int:
+        """Сумма выигрышей всех игр, точное целое"""
+        return sum(int(count) << flips for flips, count in enumerate(self.counts.tolist()) if count)
+
+    def mean(self) -> float:
+        """Средний выигрыш (деление целых Python без переполнения)"""
+        return self.total() / self.games if self.games else 0.0
+
+    def max_flips(self) -> int:
+        """Наибольшее число подбрасываний в сыгранных играх"""
+        return int(np.flatnonzero(self.counts)[-1]) if self.games else 0
+
+    def quantile(self, q) -> int:
+        """Квантиль q выигрыша: наименьший 2^n, для которого доля игр с не большим выигрышем >= q"""
+        flips = int(np.searchsorted(np.cumsum(self.counts), q * self.games, side="left"))
+        return 1 << flips
+
+    def histogram(self) -> list[dict]:
+        """Непустые корзины: число подбрасываний n (корзина выигрыша 2^n) и количество игр"""
+        return [{"flips": flips, "count": count}
+                for flips, count in enumerate(self.counts.tolist()) if count]
+
+    def summary(self) -> dict:
+        """Строка траектории: игры, среднее, log2 игр (ориентир роста среднего), максимум и квантили"""
+        row = {
+            "games": self.games,
+            "mean": round(self.mean(), 4),
+            "log2_games": round(math.log2(self.games), 4) if self.games else 0.0,
+            "max_flips": self.max_flips()
+        }
+        for name, q in quantiles.items():
+            row[name] = self.quantile(q)
+        return row
+
+
+def draw_geometric(rng: np.random.Generator, histogram: PayoffHistogram, games, chunk=chunk_size):
+    """Игры блоками: число подбрасываний до первого орла - геометрическая величина с p = 1/2"""
+    for start in range(0, games, chunk):
+        size = min(chunk, games - start)
+        with timer("st_petersburg", "sampling"):
+            flips = rng.geometric(0.5, size)
+        with timer("st_petersburg", "scoring"):
+            histogram.add_flips(flips)
+
+
+def draw_multinomial(rng: np.random.Generator, histogram: PayoffHistogram, games):
+    """Счетчики игр по числу подбрасываний сразу для всего блока: полиномиальное распределение
+    с вероятностями 2^-n для n = 1..max_flips, игры длиннее max_flips добираются геометрически
+    распределение счетчиков совпадает с draw_geometric, а время не зависит от количества игр"""
+    with timer("st_petersburg", "sampling"):
+        pvals = np.r_[0.0, 0.5 ** np.arange(1, max_flips + 1), 0.5 ** max_flips]
+        counts = rng.multinomial(games, pvals)
+        tail = int(counts[-1])
+        counts = counts[:-1]
+        if tail:
+            flips = max_flips + rng.geometric(0.5, tail)
+            counts = np.r_[counts, np.zeros(int(flips.max()) + 1 - len(counts), dtype=np.int64)]
+            np.add.at(counts, flips, 1)
+    with timer("st_petersburg", "scoring"):
+        histogram.add_counts(counts)
+
+
+def get_checkpoints(games, count=50) -> list[int]:
+    """Логарифмически равномерные контрольные точки 1..games, последняя - games"""
+    return np.unique(np.geomspace(1, games, max(2, count)).astype(np.int64)).tolist()
+
+
+def valid_data(data) -> bool:
+    """Проверка движка, количества игр и контрольных точек"""
+    return (data.engine in engines and 0 < data.games <= max_games[data.engine]
+            and 0 < data.checkpoints <= max_checkpoints)
+
+
+def stream_games(games, checkpoints=50, engine="geometric", seed=None):
+    """Траектория среднего выигрыша: строка PayoffHistogram.summary в каждой контрольной точке,
+    последняя строка с done=True содержит время и гистограмму
+    память постоянна: хранятся только счетчики по числу подбрасываний
+    игры в метрики не записываются: функция выполняется и в процессе пула, см. count_games"""
+    rng = np.random.default_rng(seed)
+    histogram = PayoffHistogram()
+    start = time.perf_counter()
+    for checkpoint in get_checkpoints(games, checkpoints):
+        size = checkpoint - histogram.games
+        if engine == "multinomial":
+            draw_multinomial(rng, histogram, size)
+        else:
+            draw_geometric(rng, histogram, size)
+        row = histogram.summary()
+        row["done"] = checkpoint == games
+        if row["done"]:
+            row["time"] = round(time.perf_counter() - start, 4)
+            row["histogram"] = histogram.histogram()
+        yield row
+
+
+def count_games(rows):
+    """Запись игр итоговой строки в метрики основного процесса, строки проходят без изменений"""
+    for row in rows:
+        if row["done"]:
+            count_trials("st_petersburg", row["games"], row["time"])
+        yield row
+
+
+def run_games(games, checkpoints=50, engine="geometric", seed=None) -> dict:
+    """stream_games целиком: итог и траектория среднего по контрольным точкам"""
+    rows = list(stream_games(games, checkpoints, engine, seed))
+    result = rows[-1]
+    result["trajectory"] = [{key: row[key] for key in ("games", "mean", "max_flips")} for row in rows]
+    return result
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from Models.St_Petersburg import StPetersburgData
+from Experiments.result_cache import result_cache
+from Experiments.executor import run_in_pool
+from Experiments.etag import static_response
+from Experiments.metrics import count_trials, ndjson_lines
+from .Logic import (
+    count_games,
+    run_games,
+    stream_games,
+    valid_data
+)
+
+rules = """# 🪙 Игра Санкт-Петербурга
+### Сколько вы готовы заплатить за участие в игре с бесконечным средним выигрышем?
+
+---
+
+Монетку подбрасывают до первого **орла**. Если орел выпал на **n**-м броске, выигрыш равен **2ⁿ**.
+
+* С вероятностью **1/2** игра заканчивается сразу и приносит **2**.
+* С вероятностью **1/4** — **4**, с вероятностью **1/8** — **8**, и так далее.
+
+Каждое слагаемое среднего равно **1**, а слагаемых бесконечно много: **математическое ожидание бесконечно**.
+Но на практике средний выигрыш растет очень медленно — примерно как **log₂** от числа сыгранных игр,
+а редкие огромные выигрыши делают траекторию среднего ступенчатой.
+"""
+
+router = APIRouter(
+    prefix="/st_petersburg",
+    tags=["StPetersburg"]
+)
+
+
+@router.get("/info")
+def info(request: Request):
+    return static_response(request, {
+        "status": "Good",
+        "rules": rules
+    })
+
+
+@router.post("/simulate")
+async def st_petersburg_simulate(data: StPetersburgData):
+    if not valid_data(data):
+        raise HTTPException(status_code=400, detail="Данные не прошли валидацию")
+
+    async def compute():
+        result = await run_in_pool(run_games, data.games, data.checkpoints, data.engine, data.seed)
+        count_trials("st_petersburg", result["games"], result["time"])
+        return result
+
+    return await result_cache.get_or_compute(result_cache.make_key("st_petersburg/simulate", data), compute)
+
+
+@router.post("/stream")
+def st_petersburg_stream(data: StPetersburgData):
+    if not valid_data(data):
+        raise HTTPException(status_code=400, detail="Данные не прошли валидацию")
+    rows = count_games(stream_games(data.games, data.checkpoints, data.engine, data.seed))
+    return StreamingResponse(ndjson_lines(rows, "st_petersburg"), media_type="application/x-ndjson")
@@ -0,0 +1,89 @@
+import time
+
+z_95 = 1.96  # Квантиль нормального распределения для 95% доверительного интервала
+stream_block = 100_000  # Наибольший блок испытаний между проверками времени
+
+
+def estimate(name, win, trials) -> dict:
+    """Оценка доли в процентах: значение, стандартная ошибка и ширина 95% интервала"""
+    rate = win / trials
+    se = (rate * (1 - rate) / trials) ** 0.5 * 100
+    return {name: round(rate * 100, 2), f"{name}_SE": round(se, 4), f"{name}_CI": round(2 * z_95 * se, 4)}
+
+
+def get_update(wins: dict, trials, start, done=False) -> dict:
+    """Строка потока: испытаний выполнено, оценки всех величин, время с начала расчета"""
+    update = {"trials": trials, "done": done, "time": round(time.perf_counter() - start, 4)}
+    for name, win in wins.items():
+        update.update(estimate(name, win, trials))
+    return update
+
+
+def progress_stream(draw, total, every=100_000, interval=0.25):
+    """Расчет блоками с промежуточными оценками
+    draw(size) - функция, возвращающая словарь {величина: количество успехов} в size испытаниях
+    строка отдается каждые every испытаний или каждые interval секунд, последняя - с done=True
+    генератор строк в формате get_update"""
+    block = max(1, min(every, stream_block))
+    wins = {}
+    trials = reported = 0
+    start = last = time.perf_counter()
+    while trials < total:
+        size = min(block, total - trials)
+        for name, win in draw(size).items():
+            wins[name] = wins.get(name, 0) + int(win)
+        trials += size
+        now = time.perf_counter()
+        if trials < total and (trials - reported >= every or now - last >= interval):
+            reported, last = trials, now
+            yield get_update(wins, trials, start)
+    yield get_update(wins, trials, start, done=True)
+
+
+adaptive_first = 10_000  # Первый блок адаптивного расчета
+adaptive_growth = 2  # Во сколько раз блок может вырасти за шаг
+max_budget = 60.0  # Предел времени адаптивного расчета в секундах
+
+
+def get_target_se(target_se=None, target_ci=None):
+    """Целевая стандартная ошибка в процентах из ошибки или полуширины 95% интервала
+    возвращает None, если цель не задана или не положительна"""
+    target = target_se if target_se is not None else (target_ci / z_95 if target_ci is not None else None)
+    return target if target is not None and target > 0 else None
+
+
+def valid_target(target_se=None, target_ci=None, budget=5.0):
+    """Проверка параметров адаптивного расчета"""
+    return get_target_se(target_se, target_ci) is not None and 0 < budget <= max_budget
+
+
+def adaptive_run(draw, target_se, budget=5.0, max_trials=10 ** 8, first=adaptive_first):
+    """Расчет растущими блоками до достижения целевой стандартной ошибки (в процентах)
+    по всем величинам, исчерпания бюджета времени или max_trials испытаний
+    доля для остановки берется как (успехи + 1) / (испытания + 2): при наблюдаемой доле 0 или 1
+    ошибка не обращается в ноль и расчет не останавливается после первого блока
+    размер следующего блока - прогноз недостающих испытаний по текущей доле p:
+    n = p(1-p) / se^2, но не больше adaptive_growth * выполненных и не больше,
+    чем успеет выполниться за остаток бюджета при измеренной скорости
+    возвращает итоговую строку get_update с полем target_reached"""
+    wins = {}
+    trials = 0
+    size = min(first, max_trials)
+    start = time.perf_counter()
+    while True:
+        for name, win in draw(size).items():
+            wins[name] = wins.get(name, 0) + int(win)
+        trials += size
+        rates = [(win + 1) / (trials + 2) for win in wins.values()]
+        se = max((rate * (1 - rate) / trials) ** 0.5 * 100 for rate in rates)
+        reached = se <= target_se
+        elapsed = time.perf_counter() - start
+        if reached or trials >= max_trials or elapsed >= budget:
+            break
+        need = max(rate * (1 - rate) for rate in rates) * 10 ** 4 / target_se ** 2
+        affordable = trials / elapsed * (budget - elapsed) if elapsed > 0 else adaptive_growth * trials
+        size = int(min(max(need - trials, first), adaptive_growth * trials, max_trials - trials))
+        size = max(1, min(size, int(affordable)))
+    update = get_update(wins, trials, start, done=True)
+    update["target_reached"] = reached
+    return update
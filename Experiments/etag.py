@@ -0,0 +1,22 @@
+import hashlib
+import json
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+max_age = 3600  # Секунды, на которые клиент может сохранить статические данные
+
+
+def make_etag(payload) -> str:
+    """Сильный ETag: хэш от канонического JSON (ключи отсортированы), одинаков между перезапусками"""
+    body = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def static_response(request: Request, payload, age=max_age) -> Response:
+    """Ответ для статических данных (правила, список экспериментов) с ETag и Cache-Control
+    Если клиент прислал совпадающий If-None-Match, возвращается 304 без тела"""
+    etag = make_etag(payload)
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={age}"}
+    if etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(payload, headers=headers)
@@ -0,0 +1,61 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from Experiments.metrics import collect, record_stages
+
+max_workers = os.cpu_count() or 1  # Один процесс на ядро
+shard_min = 500_000  # Минимальный размер шарда по умолчанию
+max_shards = 64  # Предел шардов одной задачи, не зависит от числа ядер ради воспроизводимости
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Общий пул процессов для CPU-нагрузки экспериментов, создается при первом обращении"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=max_workers)
+    return _executor
+
+
+def shutdown():
+    """Остановка пула процессов (при завершении приложения)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+def spawn_seeds(seed, count) -> list[int]:
+    """Детерминированные независимые под-сиды из одного сида через SeedSequence,
+    seed=None - случайная энтропия"""
+    return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(count)]
+
+
+def split_trials(total, shards) -> list[int]:
+    """Разбиение total испытаний на shards почти равных частей"""
+    size, rest = divmod(total, shards)
+    return [size + (i < rest) for i in range(shards)]
+
+
+async def run_in_pool(func, *args):
+    """Выполнение func(*args) в пуле процессов без блокировки event loop
+    замеры этапов из процесса пула переносятся в метрики основного процесса"""
+    loop = asyncio.get_running_loop()
+    result, stages = await loop.run_in_executor(get_executor(), collect, func, *args)
+    record_stages(stages)
+    return result
+
+
+async def run_sharded(func, total, merge, *args, seed=None, min_size=shard_min):
+    """Параллельный запуск крупной задачи шардами по процессам
+    func(trials, seed, *args) - расчет одного шарда, merge(list) - объединение результатов
+    каждый шард не меньше min_size испытаний, разбиение зависит только от total,
+    поэтому результат при заданном seed не меняется от числа ядер"""
+    shards = max(1, min(max_shards, total // min_size))
+    sizes = split_trials(total, shards)
+    seeds = spawn_seeds(seed, shards)
+    results = await asyncio.gather(*(run_in_pool(func, size, shard_seed, *args)
+                                     for size, shard_seed in zip(sizes, seeds)))
+    return merge(results)
@@ -0,0 +1,157 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from fastapi.responses import JSONResponse
+
+buckets = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)  # Границы гистограмм, с
+
+descriptions = {
+    "http_requests_total": ("counter", "Количество запросов по маршруту и статусу"),
+    "http_request_duration_seconds": ("histogram", "Время обработки запроса до конца тела ответа"),
+    "http_requests_in_flight": ("gauge", "Запросы, обрабатываемые сейчас"),
+    "experiment_stage_seconds": ("histogram", "Время этапов расчета: generation, sampling, scoring, serialization"),
+    "experiment_trials_total": ("counter", "Выполненные испытания (игры, симуляции)"),
+    "experiment_compute_seconds_total": ("counter", "Время расчета испытаний"),
+    "experiment_trials_per_second": ("gauge", "Скорость последнего расчета, испытаний в секунду"),
+}
+
+_collector: list | None = None  # Этапы, накопленные внутри процесса пула
+
+
+class Registry:
+    """Метрики процесса приложения в памяти и их вывод в текстовом формате Prometheus
+    ключ значения - (имя метрики, отсортированный кортеж меток)"""
+
+    def __init__(self):
+        self._values: dict = {}  # счетчики и датчики
+        self._histograms: dict = {}  # ключ -> [количество по корзинам, сумма, количество]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(name, labels) -> tuple:
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        """Увеличение счетчика или датчика"""
+        key = self.get_key(name, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """Установка значения датчика"""
+        with self._lock:
+            self._values[self.get_key(name, labels)] = value
+
+    def observe(self, name, value, **labels):
+        """Наблюдение гистограммы: значение попадает во все корзины с границей не меньше него"""
+        key = self.get_key(name, labels)
+        with self._lock:
+            histogram = self._histograms.setdefault(key, [[0] * len(buckets), 0.0, 0])
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram[0][i] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+            self._histograms.clear()
+
+    @staticmethod
+    def escape(value) -> str:
+        """Экранирование значения метки: обратная косая черта, кавычка и перевод строки"""
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    def format_labels(self, labels, **extra) -> str:
+        items = list(labels) + list(extra.items())
+        if not items:
+            return ""
+        return "{" + ",".join(f'{key}="{self.escape(value)}"' for key, value in items) + "}"
+
+    def render(self) -> str:
+        """Все метрики в текстовом формате Prometheus (version 0.0.4)"""
+        with self._lock:
+            values = dict(self._values)
+            histograms = {key: (list(counts), total, count) for key, (counts, total, count) in self._histograms.items()}
+        lines = []
+        for name, (kind, text) in descriptions.items():
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "histogram":
+                for (metric, labels), (counts, total, count) in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    for bound, bucket in zip(buckets, counts):
+                        lines.append(f"{name}_bucket{self.format_labels(labels, le=bound)} {bucket}")
+                    lines.append(f'{name}_bucket{self.format_labels(labels, le="+Inf")} {count}')
+                    lines.append(f"{name}_sum{self.format_labels(labels)} {total}")
+                    lines.append(f"{name}_count{self.format_labels(labels)} {count}")
+            else:
+                for (metric, labels), value in sorted(values.items()):
+                    if metric == name:
+                        lines.append(f"{name}{self.format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def record_stage(experiment, stage, seconds):
+    """Запись длительности этапа: в процессе пула - в накопитель для передачи в основной процесс"""
+    if _collector is not None:
+        _collector.append((experiment, stage, seconds))
+    else:
+        registry.observe("experiment_stage_seconds", seconds, experiment=experiment, stage=stage)
+
+
+@contextmanager
+def timer(experiment, stage):
+    """Замер этапа расчета горячего пути: with timer("monty_hall", "sampling"): ..."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(experiment, stage, time.perf_counter() - start)
+
+
+def collect(func, *args):
+    """Вызов func(*args) в процессе пула со сбором замеров этапов
+    возвращает (результат, список этапов) для record_stages в основном процессе"""
+    global _collector
+    _collector = []
+    try:
+        return func(*args), _collector
+    finally:
+        _collector = None
+
+
+def record_stages(stages):
+    """Перенос замеров этапов из процесса пула в метрики основного процесса"""
+    for experiment, stage, seconds in stages:
+        registry.observe("experiment_stage_seconds", seconds, experiment=experiment, stage=stage)
+
+
+def count_trials(experiment, trials, seconds):
+    """Счетчики испытаний и скорость расчета эксперимента"""
+    registry.inc("experiment_trials_total", trials, experiment=experiment)
+    registry.inc("experiment_compute_seconds_total", seconds, experiment=experiment)
+    if seconds > 0:
+        registry.set("experiment_trials_per_second", round(trials / seconds, 1), experiment=experiment)
+
+
+def ndjson_lines(rows, experiment):
+    """Строки NDJSON для StreamingResponse с замером сериализации каждой строки"""
+    for row in rows:
+        with timer(experiment, "serialization"):
+            line = json.dumps(row) + "\n"
+        yield line
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse с замером сериализации ответа как этапа serialization"""
+
+    def render(self, content) -> bytes:
+        with timer("api", "serialization"):
+            return super().render(content)
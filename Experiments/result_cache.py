@@ -0,0 +1,88 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from pydantic import BaseModel
+
+
+class ResultCache:
+    """Кэш результатов эндпоинтов симуляции с TTL, LRU-вытеснением и объединением запросов:
+    одновременные одинаковые запросы ждут одно вычисление (single-flight), а не запускают N
+    вычисление идет отдельной задачей, поэтому отключение одного клиента его не отменяет"""
+
+    def __init__(self, maxsize=1024, ttl=300.0):
+        self.maxsize = maxsize  # Предел количества результатов
+        self.ttl = ttl  # Время жизни результата в секундах
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # Запросы, дождавшиеся чужого вычисления
+        self._data: OrderedDict = OrderedDict()  # ключ -> (время истечения, результат)
+        self._pending: dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def make_key(name, data: BaseModel) -> str:
+        """Нормализованный ключ: имя эндпоинта и поля запроса (включая seed) в отсортированном JSON"""
+        return name + ":" + json.dumps(data.model_dump(mode="json"), sort_keys=True)
+
+    async def get_or_compute(self, key, compute):
+        """Результат из кэша, из уже идущего вычисления или новый
+        compute - функция без аргументов, возвращающая корутину расчета"""
+        item = self._data.get(key)
+        if item is not None and item[0] > time.monotonic():
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+        task = self._pending.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self.run(key, compute))
+            task.add_done_callback(self.retrieve)
+            self._pending[key] = task
+        # shield: отмена ожидающего запроса не отменяет общее вычисление
+        return await asyncio.shield(task)
+
+    async def run(self, key, compute):
+        """Общее вычисление для всех ожидающих: результат сохраняется в кэш, даже если все клиенты ушли"""
+        try:
+            value = await compute()
+            self.put(key, value)
+            return value
+        finally:
+            del self._pending[key]
+
+    @staticmethod
+    def retrieve(task: asyncio.Task):
+        """Ошибка вычисления считается обработанной, если ожидающих не осталось"""
+        if not task.cancelled():
+            task.exception()
+
+    def put(self, key, value):
+        """Сохранение результата с вытеснением давно не использованных"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """Очистка кэша и счетчиков"""
+        self._data.clear()
+        self.hits = self.misses = self.coalesced = 0
+
+    def stats(self) -> dict:
+        """Счетчики кэша: попадания, промахи, объединенные запросы и доля обслуженных без расчета"""
+        total = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.coalesced) / total, 4) if total else 0.0,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl
+        }
+
+
+result_cache = ResultCache()
@@ -1,10 +1,14 @@
 import requests
+from HttpClient import http_client
 
 
 class ClientCheck:
     @staticmethod
     def get_response(url):
-        response = requests.get(url=url)
+        try:
+            response = http_client.get(url)
+        except requests.exceptions.RequestException:
+            return False
         if response.status_code == 200:
             return True
         return False
@@ -1,5 +1,6 @@
 import streamlit as st
-import requests
+from HttpClient import http_client
+from MetadataCache import metadata_cache
 from MontyHall.MontyHallPage import MontyHallPage
 from PlaygroundParadox.PlaygroundParadoxPage import PlayGroundPage
 
@@ -14,12 +15,8 @@ class HomePage:
     def __init__(self):
         self.start()
 
-    def get_response(self):
-        return requests.get(url=self.url)
-
     def get_data(self):
-        response = self.get_response()
-        self.data = response.json()
+        self.data = metadata_cache.get(self.url)
 
     def start(self):
         self.get_data()
@@ -42,6 +39,9 @@ class HomePage:
                 index=None,
                 placeholder="Нажмите сюда"
             )
+            with st.expander("Сеть"):
+                st.json(http_client.latency_stats())
+                st.json(metadata_cache.stats())
             return status_filter
 
     def render(self):
@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class HttpClient:
+    """
+    Общий HTTP-клиент фронтенда.
+
+    Держит пул keep-alive соединений (одно TCP+TLS соединение переиспользуется
+    между запросами и перезапусками скрипта Streamlit), повторяет с экспоненциальной
+    задержкой запросы, не дошедшие до сервера или получившие 502/503/504,
+    и запоминает задержку каждого вызова.
+
+    Attributes:
+        session (requests.Session): Сессия с пулом соединений.
+        timeout (float): Таймаут запроса по умолчанию, секунды.
+        calls (deque): Последние вызовы (метод, url, статус, задержка в секундах).
+    """
+
+    def __init__(self, pool_size: int = 20, retries: int = 3, backoff: float = 0.5,
+                 timeout: float = 20, history: int = 200):
+        # Повторяются только ошибки соединения и недоступность шлюза: тяжелый расчет после таймаута
+        # чтения или ответа 500 повторно не отправляется, а последний ответ отдается как есть
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            backoff_factor=backoff,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=None,  # эндпоинты симуляции идемпотентны, повторяем и POST
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.timeout = timeout
+        self.calls = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Выполняет запрос через пул соединений и записывает его задержку.
+
+        Args:
+            method (str): HTTP-метод.
+            url (str): Полный адрес.
+            **kwargs: Параметры requests (json, headers, stream, timeout).
+
+        Returns:
+            requests.Response: Ответ сервера.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        status = None
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            with self._lock:
+                self.calls.append((method, url, status, time.perf_counter() - start))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET-запрос через общий пул."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, json: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+        """POST-запрос с JSON-телом через общий пул."""
+        return self.request("POST", url, json=json, **kwargs)
+
+    def latency_stats(self) -> Dict[str, Any]:
+        """Сводка задержек последних вызовов.
+
+        Returns:
+            dict: Количество вызовов, последняя, медианная и максимальная задержка в мс.
+        """
+        with self._lock:
+            latency = sorted(call[-1] for call in self.calls)
+            last = self.calls[-1][-1] if self.calls else 0.0
+        if not latency:
+            return {"calls": 0}
+        return {
+            "calls": len(latency),
+            "last_ms": round(last * 1000, 1),
+            "p50_ms": round(latency[len(latency) // 2] * 1000, 1),
+            "max_ms": round(latency[-1] * 1000, 1)
+        }
+
+
+http_client = HttpClient()
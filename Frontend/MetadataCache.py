@@ -0,0 +1,106 @@
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+from HttpClient import http_client
+
+
+class MetadataCache:
+    """
+    Кэш статических данных бэкенда (правила, список экспериментов) на уровне процесса.
+
+    Модуль импортируется один раз, поэтому кэш общий для всех сессий Streamlit
+    и переживает перезапуски скрипта при каждом действии с виджетами.
+    Свежая запись отдается без сети; устаревшая отдается сразу, а обновляется
+    в фоновом потоке условным запросом If-None-Match (ответ 304 без тела).
+
+    Attributes:
+        ttl (float): Время жизни записи по умолчанию, если сервер не прислал max-age.
+        hits (int): Ответы из кэша без обращения к сети.
+        refreshes (int): Фоновые обновления.
+        not_modified (int): Обновления, закончившиеся ответом 304.
+    """
+
+    def __init__(self, ttl: float = 600):
+        self.ttl = ttl
+        self.hits = 0
+        self.refreshes = 0
+        self.not_modified = 0
+        self._data: Dict[str, Dict[str, Any]] = {}  # url -> {"data", "etag", "expires"}
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+
+    def get_ttl(self, response) -> float:
+        """Время жизни из заголовка Cache-Control (max-age), иначе ttl по умолчанию."""
+        match = re.search(r"max-age=(\d+)", response.headers.get("Cache-Control", ""))
+        return float(match.group(1)) if match else self.ttl
+
+    def fetch(self, url: str) -> Dict[str, Any]:
+        """Запрос к серверу с If-None-Match, если ETag уже известен; обновляет запись."""
+        entry = self._data.get(url)
+        headers = {"If-None-Match": entry["etag"]} if entry and entry["etag"] else {}
+        response = http_client.get(url, headers=headers)
+        if response.status_code == 304 and entry:
+            self.not_modified += 1
+            data = entry["data"]
+        else:
+            response.raise_for_status()
+            data = response.json()
+        with self._lock:
+            self._data[url] = {
+                "data": data,
+                "etag": response.headers.get("ETag"),
+                "expires": time.monotonic() + self.get_ttl(response)
+            }
+        return data
+
+    def refresh(self, url: str):
+        """Фоновое обновление устаревшей записи; при ошибке остается старое значение."""
+        try:
+            self.fetch(url)
+            self.refreshes += 1
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(url)
+
+    def get(self, url: str) -> Dict[str, Any]:
+        """
+        JSON-ответ GET-запроса по url.
+
+        Args:
+            url (str): Полный адрес статического эндпоинта.
+
+        Returns:
+            dict: Данные из кэша или с сервера (при первом обращении).
+        """
+        with self._lock:
+            entry = self._data.get(url)
+            if entry is not None:
+                self.hits += 1
+                if entry["expires"] <= time.monotonic() and url not in self._refreshing:
+                    self._refreshing.add(url)
+                    threading.Thread(target=self.refresh, args=(url,), daemon=True).start()
+                return entry["data"]
+        return self.fetch(url)
+
+    def clear(self, url: Optional[str] = None):
+        """Удаление одной записи или всего кэша."""
+        with self._lock:
+            if url is None:
+                self._data.clear()
+            else:
+                self._data.pop(url, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Счетчики кэша для отображения в интерфейсе."""
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "refreshes": self.refreshes,
+            "not_modified": self.not_modified
+        }
+
+
+metadata_cache = MetadataCache()
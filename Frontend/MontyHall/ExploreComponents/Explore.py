@@ -10,10 +10,12 @@ class Explore:
     Attributes:
         service: Экземпляр класса Service для выполнения бизнес-логики.
         field_name: Название колонки, используемой в качестве индекса (ось X).
-        const: Константа для смещения индекса таблицы.
+        column: Поле строки ответа со значением исследуемого параметра.
+        const: Константа для смещения индекса таблицы, если в строках нет поля column.
     """
     service = Service()
     field_name = ""
+    column = ""
     const = 0
 
     def render_graph(self, pandas_table):
@@ -113,6 +115,9 @@ class Explore:
     def create_pandas_table(self, data_set):
         """Преобразует список словарей в DataFrame и настраивает индекс.
 
+        Значения оси X берутся из поля column строк ответа: сервер пропускает
+        некорректные точки сетки, поэтому номер строки может не совпадать со значением.
+
         Args:
             data_set (list): Список словарей с данными симуляции.
 
@@ -120,7 +125,10 @@ class Explore:
             pd.DataFrame: Подготовленная таблица с установленным индексом.
         """
         df = pn.DataFrame(data_set)
-        df[self.field_name] = df.index + self.const
+        if self.column in df.columns:
+            df[self.field_name] = df[self.column]
+        else:
+            df[self.field_name] = df.index + self.const
         df = df.set_index(self.field_name)
         return df
 
@@ -177,6 +185,51 @@ class Explore:
         """Метод для выполнения сетевого запроса и получения данных симуляции."""
         pass
 
+    def run_sweep(self, payload, url):
+        """Запрашивает всю сетку параметров одним запросом к /sweep.
+
+        Args:
+            payload (dict): Оси сетки (списки или диапазоны {"start", "stop"}) и "iterable".
+            url (str): Адрес эндпоинта /monty_hall/sweep.
+
+        Returns:
+            list | None: Строки таблицы с полями Change, Stay, T_Change, T_Stay или None при ошибке.
+        """
+        response = self.service.stream_request(payload, url)
+        if isinstance(response, dict):
+            st.error(response.get("msg", "Ошибка сервера"))
+            return None
+        return response
+
+    def render_convergence(self, payload, url, names=("Change", "Stay")):
+        """Рисует сходимость оценок по мере прихода промежуточных результатов потока.
+
+        Args:
+            payload (dict): Параметры эксперимента для потокового эндпоинта.
+            url (str): Адрес эндпоинта /monty_hall/simulate_stream.
+            names (tuple): Отображаемые величины.
+
+        Returns:
+            dict | None: Последняя строка потока (итоговые оценки) или None при ошибке.
+        """
+        progress = st.progress(0.0, text="Симуляция...")
+        chart = None
+        update = None
+        for update in self.service.iter_stream(payload, url):
+            if "trials" not in update:
+                st.error(update.get("msg", "Ошибка сервера"))
+                return None
+            row = pn.DataFrame([{name: update[name] for name in names}], index=[update["trials"]])
+            if chart is None:
+                chart = st.line_chart(row)
+            else:
+                chart.add_rows(row)
+            progress.progress(update["trials"] / payload["iterable"],
+                              text=f"Игр: {update['trials']:,}, ширина 95% интервала: "
+                                   f"±{update[f'{names[0]}_CI'] / 2:.3f}%")
+        progress.empty()
+        return update
+
     def process_and_render_results(self):
         """Управляет процессом обработки данных из состояния сессии и их визуализацией."""
         if not st.session_state.get("data_set"):
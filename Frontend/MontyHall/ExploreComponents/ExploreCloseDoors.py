@@ -4,6 +4,7 @@ from .Explore import Explore
 
 class ExploreCloseDoors(Explore):
     field_name = "Закрытые двери"
+    column = "closed_doors"
     const = 1
 
     def explore(self, url, text_validation):
@@ -34,7 +35,6 @@ class ExploreCloseDoors(Explore):
 
     def run_simulation(self, min_close_doors, prize, max_close_doors, doors, it, text_validation, url):
         """Бизнес-логика: сбор данных через API."""
-        data_set = []
         # Валидация всех шагов перед запуском
         for close_doors in range(min_close_doors, max_close_doors + 1):
             response_valid_test = self.valid_input_data(prize, doors, close_doors)
@@ -43,20 +43,13 @@ class ExploreCloseDoors(Explore):
                 return None
 
         status_text = st.empty()
-        for close_doors in range(min_close_doors, max_close_doors + 1):
-            status_text.text(f"⏳ Симуляция для {close_doors} закрытых дверей...")
-            payload = {
-                "count_prize": prize,
-                "count_doors": doors,
-                "closed_doors": close_doors,
-                "iterable": it
-            }
-            response = self.service.post_request(payload, url)
-
-            if self.service.check_response(response):
-                theory_data = self.get_theory(doors=doors, prize=prize, closed=close_doors)
-                response["data"]["Customizable"].update(theory_data)
-                data_set.append(response["data"]["Customizable"])
-            else:
-                return None
+        status_text.text(f"⏳ Симуляция для {min_close_doors}-{max_close_doors} закрытых дверей...")
+        payload = {
+            "count_prize": [prize],
+            "count_doors": [doors],
+            "closed_doors": {"start": min_close_doors, "stop": max_close_doors},
+            "iterable": it
+        }
+        data_set = self.run_sweep(payload, url)
+        status_text.text("✅ Расчеты завершены!")
         return data_set
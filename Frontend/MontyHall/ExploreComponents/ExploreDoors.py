@@ -1,64 +1,12 @@
 import streamlit as st
 from .Explore import Explore
-import asyncio
-import httpx
 
 
 class ExploreDoors(Explore):
     field_name = "двери"
+    column = "count_doors"
     const = 3
 
-    async def fetch_door_data(self, client, door, prize, close_doors, it, url):
-        """Отдельная асинхронная задача для одной двери"""
-        payload = {
-            "count_prize": prize,
-            "count_doors": door,
-            "closed_doors": close_doors,
-            "iterable": it
-        }
-
-        # Асинхронный POST запрос
-        response = await client.post(url, json=payload, timeout=30.0)
-
-        if response.status_code == 200:
-            data = response.json()
-            # Добавляем теоретические данные (твоя функция get_theory)
-            theory_data = self.get_theory(doors=door, prize=prize, closed=close_doors)
-            data["data"]["Customizable"].update(theory_data)
-            return data["data"]["Customizable"]
-        else:
-            return None
-
-    async def run_simulation_async(self, start_door, prize, end_doors, close_doors, it, url):
-        """Основной цикл, запускающий все запросы разом"""
-
-        # 1. Валидация (оставляем как есть, это быстро)
-        for door in range(start_door, end_doors + 1):
-            res_valid = self.valid_input_data(prize, door, close_doors)
-            if not res_valid["status"]:
-                st.error(res_valid["text"])
-                return None
-
-        status_text = st.empty()
-        status_text.text("🚀 Запуск параллельных симуляций...")
-
-        # 2. Создаем список задач (tasks)
-        tasks = []
-        # Используем AsyncClient для эффективных соединений
-        async with httpx.AsyncClient() as client:
-            for door in range(close_doors + 2, end_doors + 1):
-                # Создаем "задание", но пока не запускаем его
-                task = self.fetch_door_data(client, door, prize, close_doors, it, url)
-                tasks.append(task)
-
-            # 3. МАГИЯ: Запускаем все задачи ОДНОВРЕМЕННО
-            # gather вернет список результатов в том же порядке
-            data_set = await asyncio.gather(*tasks)
-
-        status_text.text("✅ Расчеты завершены!")
-        # Фильтруем None, если какие-то запросы упали
-        return [d for d in data_set if d is not None]
-
     def explore(self, url, text_validation):
         with st.container(border=True):
             st.write("Выясним, как растет преимущество смены выбора с увеличением общего числа дверей.")
@@ -100,7 +48,6 @@ class ExploreDoors(Explore):
 
     def run_simulation(self, start_door, prize, end_doors, close_doors, it, url):
         """Бизнес-логика: сбор данных через API."""
-        data_set = []
         # Валидация всех шагов перед запуском
         for door in range(start_door, end_doors + 1):
             response_valid_test = self.valid_input_data(prize, door, close_doors)
@@ -109,20 +56,13 @@ class ExploreDoors(Explore):
                 return None
 
         status_text = st.empty()
-        for door in range(close_doors + 2, end_doors + 1):
-            status_text.text(f"⏳ Симуляция для {door} дверей...")
-            payload = {
-                "count_prize": prize,
-                "count_doors": door,
-                "closed_doors": close_doors,
-                "iterable": it
-            }
-            response = self.service.post_request(payload, url)
-
-            if self.service.check_response(response):
-                theory_data = self.get_theory(doors=door, prize=prize, closed=close_doors)
-                response["data"]["Customizable"].update(theory_data)
-                data_set.append(response["data"]["Customizable"])
-            else:
-                return None
+        status_text.text(f"⏳ Симуляция для {close_doors + 2}-{end_doors} дверей...")
+        payload = {
+            "count_prize": [prize],
+            "count_doors": {"start": close_doors + 2, "stop": end_doors},
+            "closed_doors": [close_doors],
+            "iterable": it
+        }
+        data_set = self.run_sweep(payload, url)
+        status_text.text("✅ Расчеты завершены!")
         return data_set
@@ -4,6 +4,7 @@ from .Explore import Explore
 
 class ExplorePrize(Explore):
     field_name = "Призы"
+    column = "count_prize"
     const = 1
 
     def explore(self, url, text_validation):
@@ -35,7 +36,6 @@ class ExplorePrize(Explore):
 
     def run_simulation(self, min_prize, close_doors, max_prize, doors, it, text_validation, url):
         """Бизнес-логика: сбор данных через API."""
-        data_set = []
         # Валидация всех шагов перед запуском
         for prize in range(min_prize, max_prize + 1):
             response_valid_test = self.valid_input_data(prize, doors, close_doors)
@@ -44,20 +44,13 @@ class ExplorePrize(Explore):
                 return None
 
         status_text = st.empty()
-        for prize in range(min_prize, max_prize + 1):
-            status_text.text(f"⏳ Симуляция для {prize} призов...")
-            payload = {
-                "count_prize": prize,
-                "count_doors": doors,
-                "closed_doors": close_doors,
-                "iterable": it
-            }
-            response = self.service.post_request(payload, url)
-
-            if self.service.check_response(response):
-                theory_data = self.get_theory(doors=doors, prize=prize, closed=close_doors)
-                response["data"]["Customizable"].update(theory_data)
-                data_set.append(response["data"]["Customizable"])
-            else:
-                return None
+        status_text.text(f"⏳ Симуляция для {min_prize}-{max_prize} призов...")
+        payload = {
+            "count_prize": {"start": min_prize, "stop": max_prize},
+            "count_doors": [doors],
+            "closed_doors": [close_doors],
+            "iterable": it
+        }
+        data_set = self.run_sweep(payload, url)
+        status_text.text("✅ Расчеты завершены!")
         return data_set
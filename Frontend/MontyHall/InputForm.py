@@ -21,6 +21,8 @@ class InputForm:
                 - "count_doors" (int): Общее количество дверей.
                 - "closed_doors" (int): Количество дверей, остающихся закрытыми.
                 - "iterable" (int): Количество итераций эксперимента.
+                - "mode" (str): Режим расчета: "simulate" или "adaptive" (до целевой точности).
+                - "target_ci" (float): Полуширина 95% интервала, только для режима "adaptive".
             Возвращает None, если кнопка "Симуляция" еще не нажата.
         """
 
@@ -49,11 +51,26 @@ class InputForm:
                 value=1
             )
 
+            precision = st.radio(
+                label="Остановка симуляции",
+                options=("По количеству итераций", "По целевой точности"),
+                horizontal=True
+            )
+
             iterable = st.number_input(
                 label="Количество итераций",
                 min_value=10,
-                max_value=1000,
-                value=100
+                max_value=10_000_000,
+                value=100_000,
+                step=10_000
+            )
+
+            target_ci = st.number_input(
+                label="Целевая точность, ± процентных пунктов (95% интервал)",
+                min_value=0.01,
+                max_value=5.0,
+                value=0.1,
+                step=0.01
             )
 
             # Кнопка отправки формы
@@ -65,11 +82,15 @@ class InputForm:
                     st.error("Количество призов должно быть меньше количества дверей!")
                     return None
 
-                return {
+                data = {
                     "count_prize": int(count_prize),
                     "count_doors": int(count_doors),
                     "closed_doors": int(closed_doors),
-                    "iterable": int(iterable)
+                    "iterable": int(iterable),
+                    "mode": "simulate"
                 }
+                if precision == "По целевой точности":
+                    data.update({"mode": "adaptive", "target_ci": float(target_ci)})
+                return data
 
         return None
@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+from MetadataCache import metadata_cache
 from .InputForm import InputForm
 from .ServiceClass import Service
 # from .ExploreDoors import ExploreDoors, ExploreCloseDoors, ExplorePrize, Explore
@@ -8,7 +8,7 @@ from .ExploreComponents import ExplorePrize, ExploreDoors, ExploreCloseDoors, Ex
 
 class MontyHallPage:
     prefix = "/monty_hall"
-    endpoints = ("/info", "/simulate")
+    endpoints = ("/info", "/simulate", "/sweep", "/simulate_stream")
     url = 'https://statistic-experiments.onrender.com'
     text = """
 # 🧠 Парадокс Монти Холла
@@ -64,15 +64,13 @@ class MontyHallPage:
     }
 
     def get_info(self):
-        response = requests.get(self.get_url(0))
-        return response.json()['rules']
+        return metadata_cache.get(self.get_url(0))['rules']
 
     def get_url(self, end):
         return self.url + self.prefix + self.endpoints[end]
 
     def post_request(self, data: dict, url):
-        response = requests.post(self.get_url(1), json=data, timeout=20)
-        return response.json()
+        return self.service.post_request(data, self.get_url(1))
 
     def check_response(self, response):
         if response["status"] == "Good":
@@ -96,7 +94,7 @@ class MontyHallPage:
         scenario = self.select_params()
         if scenario:
             experiment: Explore = self.EXPERIMENTS[scenario]()
-            experiment.explore(self.get_url(1), text_validation=self.text_validation)
+            experiment.explore(self.get_url(2), text_validation=self.text_validation)
 
         # Настройки внутри фрагмента
 
@@ -111,12 +109,17 @@ class MontyHallPage:
         return scenario
 
     def start_simulate(self, data):
-        response = self.service.post_request(data, url=self.get_url(1))
+        if data["mode"] == "adaptive":
+            response = self.service.post_request(data, url=self.get_url(1))
+            result = response["data"]["Customizable"] if self.check_response(response) else None
+            if result is not None:
+                st.caption(f"Игр понадобилось: {response['data']['trials']:,}"
+                           + ("" if response["data"]["target_reached"] else " (точность не достигнута за отведенное время)"))
+        else:
+            response = result = Explore().render_convergence(data, url=self.get_url(3))
         with st.expander("Посмотреть сырые данные от сервера"):
             st.json(response)
-        if self.check_response(response):
-            result = response["data"]["Customizable"]
-
+        if result is not None:
             stay_rate = result['Stay']
             switch_rate = result['Change']
 
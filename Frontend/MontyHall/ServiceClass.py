@@ -1,11 +1,46 @@
+import json
 import requests
+from HttpClient import http_client
 
 
 class Service:
 
+    @staticmethod
+    def error_response(error) -> dict:
+        """Ошибка сети или ответ не в JSON в формате ответа сервера"""
+        return {"status": "Bad", "msg": f"Сервер недоступен: {error}"}
+
     def post_request(self, data: dict, url):
-        response = requests.post(url, json=data, timeout=20)
-        return response.json()
+        try:
+            response = http_client.post(url, json=data)
+            return response.json()
+        except requests.exceptions.RequestException as error:
+            return self.error_response(error)
+
+    def stream_request(self, data: dict, url):
+        """POST с построчным (NDJSON) ответом, возвращает список строк
+        или словарь ошибки, если сервер ответил обычным JSON или недоступен"""
+        try:
+            with http_client.post(url, json=data, stream=True) as response:
+                if response.headers.get("content-type", "").startswith("application/json"):
+                    return response.json()
+                return [json.loads(line) for line in response.iter_lines() if line]
+        except requests.exceptions.RequestException as error:
+            return self.error_response(error)
+
+    def iter_stream(self, data: dict, url):
+        """POST с построчным (NDJSON) ответом, строки отдаются по мере прихода
+        генератор словарей; при ответе обычным JSON или ошибке сети отдается один словарь ошибки"""
+        try:
+            with http_client.post(url, json=data, stream=True, timeout=(5, None)) as response:
+                if response.headers.get("content-type", "").startswith("application/json"):
+                    yield response.json()
+                    return
+                for line in response.iter_lines():
+                    if line:
+                        yield json.loads(line)
+        except requests.exceptions.RequestException as error:
+            yield self.error_response(error)
 
     def check_response(self, response):
         if response["status"] == "Good":
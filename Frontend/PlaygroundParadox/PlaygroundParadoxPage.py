@@ -1,5 +1,7 @@
-import streamlit as st
 import requests
+import streamlit as st
+from HttpClient import http_client
+from MetadataCache import metadata_cache
 from .Plot import Plot
 from .Inspector_case.components import (
     render_head,
@@ -18,15 +20,17 @@ class PlayGroundPage:
     study = Study()
 
     def get_info(self):
-        response = requests.get(self.get_url(0))
-        return response.json()['rules']
+        return metadata_cache.get(self.get_url(0))['rules']
 
     def get_url(self, end):
         return self.url + self.prefix + self.endpoints[end]
 
     def post_request(self, data: dict, url):
-        response = requests.post(self.get_url(1), json=data, timeout=20)
-        return response.json()
+        try:
+            response = http_client.post(self.get_url(1), json=data)
+            return response.json()
+        except requests.exceptions.RequestException as error:
+            return {"status": "Bad", "msg": f"Сервер недоступен: {error}"}
 
     def render(self):
         render_head()
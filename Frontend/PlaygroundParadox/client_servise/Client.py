@@ -1,5 +1,6 @@
 import requests
 import streamlit as st
+from HttpClient import http_client
 from typing import Dict, List, Optional, Union, Any
 
 
@@ -8,7 +9,8 @@ class ClientService:
     Класс для выполнения сетевых запросов к API симуляции.
 
     Обеспечивает централизованную обработку таймаутов, ошибок сети
-    и валидацию ответов сервера.
+    и валидацию ответов сервера. Запросы идут через общий http_client
+    (пул соединений и повторы с задержкой).
     """
 
     def __init__(self, base_url: str):
@@ -33,7 +35,7 @@ class ClientService:
 
         try:
             # Выполняем запрос с таймаутом (чтобы UI не завис навсегда)
-            response = requests.post(url, json=payload, timeout=10)
+            response = http_client.post(url, json=payload, timeout=10)
 
             # Проверка статус-кодов 4xx и 5xx
             response.raise_for_status()
@@ -46,6 +48,8 @@ class ClientService:
             st.error("🚫 Не удалось подключиться к серверу. Проверьте, запущен ли он.")
         except requests.exceptions.HTTPError as e:
             st.error(f"❌ Ошибка сервера: {e}")
+        except requests.exceptions.RequestException as e:
+            st.error(f"🚫 Ошибка сети: {e}")
         except Exception as e:
             st.error(f"⚠️ Непредвиденная ошибка: {e}")
 
@@ -55,6 +59,6 @@ class ClientService:
     def check_health(url: str) -> bool:
         """Проверяет доступность сервера (Healthcheck)."""
         try:
-            return requests.get(url, timeout=2).status_code == 200
+            return http_client.get(url, timeout=2).status_code == 200
         except:
             return False
@@ -1,5 +1,4 @@
 import streamlit as st
-import requests
 from ..client_servise import ClientService
 from .components import (
     render_intro,
@@ -27,24 +26,23 @@ class Study:
     plot = Plot()
     url = 'https://statistic-experiments.onrender.com'
     prefix = "/playground"
-    endpoints = ("/info", "/start_blood_tiles")
+    endpoints = ("/info", "/start_blood_tiles", "/blood_tiles_curve")
     client = ClientService(f'https://statistic-experiments.onrender.com{prefix}')
 
     def simulate(self, data, status_btn):
         if status_btn:
-            max_value = data["value"]
-            response_data = []
-            n_count = list(range(2, max_value))
-
-            for n in n_count:
-                payload = {
-                    'weight': data["weight"],
-                    'value': n,
-                    'count_sim': data["count_sim"],
-                    'num_of_family': data["num_of_family"]
-                }
-                response_data.append(self.client.post_data(self.endpoints[1], payload)["result"])
-            data_for_plot = dict(zip(n_count, response_data))
+            payload = {
+                'weight': data["weight"],
+                'min_value': 2,
+                'max_value': data["value"] - 1,
+                'count_sim': data["count_sim"],
+                'num_of_family': data["num_of_family"],
+                'mode': "simulate"
+            }
+            response = self.client.post_data(self.endpoints[2], payload)
+            if response is None:
+                return None
+            data_for_plot = dict(zip(response["values"], response["result"]))
             return data_for_plot
 
     def render_study(self):
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class BirthdayData(BaseModel):
+    max_size: int = 60  # Кривая для групп 2..max_size
+    trials: int = 100_000
+    days: int = 365
+    weights: tuple[float, ...] | None = None  # Веса дней для неравномерного распределения, тогда days не нужен
+    mode: str = "exact"  # "exact" - точный расчет, "simulate" - Монте-Карло
+    seed: int | None = None
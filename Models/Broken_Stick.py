@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class BrokenStickData(BaseModel):
+    points: int = 1_000_000  # Количество палок (точек выборки)
+    breaks: int = 2  # Количество разломов, кусков на один больше
+    variant: str = "uniform"  # "uniform" - разломы сразу, "longer" - каждый раз ломается самый длинный кусок
+    engine: str = "random"  # "random" - псевдослучайные точки, "halton" и "sobol" - квазислучайные
+    seed: int | None = None
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class CouponData(BaseModel):
+    count: int = 50  # Количество типов купонов
+    trials: int = 100_000
+    weights: tuple[float, ...] | None = None  # Веса типов для неравных вероятностей, тогда count не нужен
+    mode: str = "exact"  # "exact" - точный расчет, "simulate" - Монте-Карло вместе с точным расчетом
+    seed: int | None = None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
 
 class MontyHallData(BaseModel):
@@ -6,3 +6,51 @@ class MontyHallData(BaseModel):
     count_doors: int = 3
     closed_doors: int = 1
     iterable: int = 1000
+    engine: str = "numpy"  # "objects" или "numpy"
+    mode: str = "exact"  # "exact", "enumerate" (перебор исходов, до 10 дверей), "simulate", "adaptive" (до заданной точности), "paired" (стратегии на одних играх)
+    seed: int | None = None
+    target_se: float | None = None  # Целевая стандартная ошибка в процентах (режим "adaptive")
+    target_ci: float | None = None  # или полуширина 95% интервала в процентах
+    time_budget: float = 5.0  # Предел времени адаптивного расчета в секундах
+
+
+class MontyHallStreamData(MontyHallData):
+    every: int = 100_000  # Промежуточная оценка каждые every игр
+    interval: float = 0.25  # или каждые interval секунд
+
+
+class SweepRange(BaseModel):
+    start: int
+    stop: int  # включительно
+    step: int = 1
+
+    @model_validator(mode="after")
+    def check_range(self):
+        if self.step <= 0 or self.stop < self.start:
+            raise ValueError("Нужны step > 0 и stop >= start")
+        return self
+
+    def __len__(self):
+        return (self.stop - self.start) // self.step + 1
+
+    def values(self):
+        return list(range(self.start, self.stop + 1, self.step))
+
+
+class MontyHallSweepData(BaseModel):
+    count_prize: list[int] | SweepRange = [1]
+    count_doors: list[int] | SweepRange = [3]
+    closed_doors: list[int] | SweepRange = [1]
+    iterable: int = 1000
+    seed: int | None = None
+
+    @staticmethod
+    def axis(value):
+        """Значения оси сетки из списка или диапазона"""
+        if isinstance(value, SweepRange):
+            return value.values()
+        return value
+
+    def axis_lengths(self) -> tuple[int, int, int]:
+        """Длины осей сетки без построения значений (для диапазона - арифметикой)"""
+        return len(self.count_prize), len(self.count_doors), len(self.closed_doors)
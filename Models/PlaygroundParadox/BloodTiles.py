@@ -2,7 +2,28 @@ from pydantic import BaseModel
 
 
 class BloodTilesData(BaseModel):
-    weight: tuple
+    weight: tuple[float, ...]
     value: int
     count_sim: int
     num_of_family: int
+    seed: int | None = None
+    engine: str = "numpy"  # "python" или "numpy"
+    mode: str = "exact"  # "exact" - точный расчет, "simulate" - Монте-Карло, "adaptive" - до заданной точности
+    target_se: float | None = None  # Целевая стандартная ошибка в процентах (режим "adaptive")
+    target_ci: float | None = None  # или полуширина 95% интервала в процентах
+    time_budget: float = 5.0  # Предел времени адаптивного расчета в секундах
+
+
+class BloodTilesStreamData(BloodTilesData):
+    every: int = 50_000  # Промежуточная оценка каждые every симуляций
+    interval: float = 0.25  # или каждые interval секунд
+
+
+class BloodTilesCurveData(BaseModel):
+    weight: tuple[float, ...]
+    min_value: int = 2
+    max_value: int
+    count_sim: int
+    num_of_family: int
+    seed: int | None = None
+    mode: str = "exact"  # "exact" - точный расчет, "simulate" - Монте-Карло
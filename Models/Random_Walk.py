@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class RandomWalkData(BaseModel):
+    walks: int = 10_000
+    steps: int = 1000
+    dim: int = 1  # Размерность решетки: 1, 2 или 3
+    level: int = 10  # Уровень первого достижения: координата в 1D, расстояние от начала в 2D и 3D
+    keep: int = 0  # Сколько первых блужданий сохранить целиком для постраничного просмотра
+    seed: int | None = None
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class StPetersburgData(BaseModel):
+    games: int = 1_000_000
+    checkpoints: int = 50  # Логарифмически равномерные точки траектории среднего
+    engine: str = "geometric"  # "geometric" - игры блоками, "multinomial" - сразу счетчики блока
+    seed: int | None = None
@@ -1,17 +1,87 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from starlette.routing import Match
+from Experiments import executor
+from Experiments.result_cache import result_cache
+from Experiments.etag import static_response
+from Experiments.metrics import registry, TimedJSONResponse
 from Experiments.MontyHall import Router as Monty
 from Experiments.PlaygroundParadox import Router as PlGr
+from Experiments.BirthdayParadox import Router as Birthday
+from Experiments.StPetersburg import Router as StPetersburg
+from Experiments.CouponCollector import Router as Coupon
+from Experiments.RandomWalk import Router as Walk
+from Experiments.BrokenStick import Router as Stick
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    executor.shutdown()  # Остановка пула процессов симуляций
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=TimedJSONResponse)
 app.include_router(Monty.router)
 app.include_router(PlGr.router)
+app.include_router(Birthday.router)
+app.include_router(StPetersburg.router)
+app.include_router(Coupon.router)
+app.include_router(Walk.router)
+app.include_router(Stick.router)
+
+
+def route_template(request: Request) -> str:
+    """Шаблон пути маршрута для меток метрик, чтобы их количество не зависело от запросов"""
+    for route in app.routes:
+        if route.matches(request.scope)[0] == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Время запроса до конца тела ответа (включая потоковые), счетчик запросов и запросы в обработке
+    ASGI-обертка: метрики фиксируются по завершении приложения, поэтому учитываются и ответы,
+    тело которых не было отправлено (клиент отключился, HEAD-запрос)
+    маршрут берется шаблоном пути, чтобы метки не зависели от параметров запроса"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        method = scope["method"]
+        route = route_template(Request(scope))
+        status = "500"  # если приложение упало до начала ответа
+
+        async def send_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        registry.inc("http_requests_in_flight", 1, route=route)
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            registry.inc("http_requests_in_flight", -1, route=route)
+            registry.inc("http_requests_total", method=method, route=route, status=status)
+            registry.observe("http_request_duration_seconds", time.perf_counter() - start,
+                             method=method, route=route)
+
+
+app.add_middleware(MetricsMiddleware)
 
 
 # uvicorn main:app --reload - для запуска сервера
 
 @app.get("/")
-def start():
-    return {
+def start(request: Request):
+    return static_response(request, {
         "status": "Good",
         "experiments":
             [{
@@ -31,9 +101,49 @@ def start():
                     "name_on_page": "Институт парадоксов родства",
                     "uuid": 123345,
                     "description": "anything"
+                },
+                {
+                    "name": "Birthday_Paradox",
+                    "name_on_page": None,
+                    "uuid": 123345,
+                    "description": "Вероятность совпадения дней рождения в группе"
+                },
+                {
+                    "name": "St_Petersburg",
+                    "name_on_page": None,
+                    "uuid": 123345,
+                    "description": "Игра с бесконечным математическим ожиданием выигрыша"
+                },
+                {
+                    "name": "Coupon_Collector",
+                    "name_on_page": None,
+                    "uuid": 123345,
+                    "description": "Сколько покупок нужно, чтобы собрать все типы купонов"
+                },
+                {
+                    "name": "Random_Walk",
+                    "name_on_page": None,
+                    "uuid": 123345,
+                    "description": "Траектории и распределение конечных позиций случайного блуждания"
+                },
+                {
+                    "name": "Broken_Stick",
+                    "name_on_page": None,
+                    "uuid": 123345,
+                    "description": "Вероятность сложить треугольник из кусков случайно сломанной палки"
                 }]
 
-    }
+    })
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/result_cache")
+def result_cache_stats():
+    return result_cache.stats()
 
 
 if __name__ == '__main__':